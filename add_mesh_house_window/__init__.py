@@ -0,0 +1,27 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+bl_info = {
+    "name": "Add House Window Mesh Plugin",
+    "author": "darek-r",
+    "version": (0, 3, 0),
+    "blender": (2, 80, 0),
+    "location": "View3D > Add > Add House Window Object",
+    "description": "Generates house window object and allows further size modification ",
+    "warning": "",
+    "doc_url": "",
+    "category": "Add Mesh",
+}
+
+# Operators (and with them bpy) are imported on register only, so the geometry
+# module stays importable from plain Python: from add_mesh_house_window import geometry
+
+
+def register():
+    from . import operators
+    operators.register()
+
+
+def unregister():
+    from . import operators
+    operators.unregister()
+
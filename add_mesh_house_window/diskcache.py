@@ -0,0 +1,156 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Optional on-disk cache of expensive generated geometry (merged window arrays,
+# walls with openings), shared by Blender sessions. A single window is cheaper to
+# generate than to load, so it is never cached. Every entry is one file named
+# after a hash of the plugin version, the kind of geometry and its inputs:
+#
+#   header   magic, format, counts of coords, vertex indices and faces
+#   float32  coords
+#   int32    vertex indices, loop starts, loop totals
+#
+# Entries are stored in native byte order, so a cache directory should not be
+# shared between machines of different endianness. The directory is kept under
+# a size limit by removing the least recently used entries. Recency is the file
+# modification time, refreshed on a hit only when it is older than TOUCH_INTERVAL,
+# so reads do not write metadata. Like geometry, this module must not import bpy.
+
+import hashlib
+import os
+import struct
+import tempfile
+import time
+from array import array
+
+MAGIC = b"HWGC"
+FORMAT_VERSION = 2
+SUFFIX = ".hwg"
+TOUCH_INTERVAL = 3600.0
+
+_header = struct.Struct("=4sIIII")
+
+
+def cache_key(version, kind, values):
+    key = (FORMAT_VERSION, tuple(version), kind, values)
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+# Digest of placement matrices, so thousands of them make a short key
+def matrices_digest(matrices):
+    values = array('d', [v for m in matrices for row in (m[0], m[1], m[2]) for v in row])
+    return hashlib.sha1(values.tobytes()).hexdigest()
+
+
+def write_entry(filepath, coords, vertex_indices, loop_starts, loop_totals):
+    # Written next to the entry and renamed, so readers never see half a file
+    directory = os.path.dirname(filepath)
+    fd, temporary = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_header.pack(MAGIC, FORMAT_VERSION, len(coords), len(vertex_indices), len(loop_totals)))
+            array('f', coords).tofile(f)
+            for values in (vertex_indices, loop_starts, loop_totals):
+                array('i', values).tofile(f)
+        os.replace(temporary, filepath)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+# Flat arrays of an entry read straight into array buffers, None if it is not a valid entry
+def read_entry(f):
+    header = f.read(_header.size)
+    if len(header) != _header.size:
+        return None
+    magic, version, coord_count, index_count, face_count = _header.unpack(header)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+
+    arrays = []
+    for typecode, count in (('f', coord_count), ('i', index_count), ('i', face_count), ('i', face_count)):
+        values = array(typecode)
+        values.fromfile(f, count)
+        arrays.append(values)
+    return tuple(arrays)
+
+
+class GeometryCache:
+
+    def __init__(self, directory, version, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.version = tuple(version)
+        self.max_bytes = max_bytes
+        # Total size of entries, counted on first store
+        self._size = None
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def load(self, key):
+        filepath = self.path(key)
+        try:
+            with open(filepath, "rb") as f:
+                arrays = read_entry(f)
+                modified = os.fstat(f.fileno()).st_mtime
+            if arrays is not None and time.time() - modified > TOUCH_INTERVAL:
+                os.utime(filepath)
+            return arrays
+        except (OSError, EOFError, struct.error):
+            return None
+
+    def store(self, key, arrays):
+        filepath = self.path(key)
+        try:
+            existed = os.path.exists(filepath)
+            write_entry(filepath, *arrays)
+        except OSError:
+            # Cache is only an optimization, a full disk must not break generation
+            return
+
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self.entries())
+        elif not existed:
+            self._size += os.path.getsize(filepath)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    # (modification time, size, path) of every entry
+    def entries(self):
+        result = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return result
+        for name in names:
+            if name.endswith(SUFFIX):
+                filepath = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(filepath)
+                except OSError:
+                    continue
+                result.append((stat.st_mtime, stat.st_size, filepath))
+        return result
+
+    # Remove least recently used entries until the cache fits into max_bytes
+    def evict(self):
+        entries = sorted(self.entries())
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, filepath in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(filepath)
+            except OSError:
+                continue
+            size -= entry_size
+        self._size = size
+
+    # Arrays of given kind and inputs, generate() is called and stored on a miss
+    def arrays(self, kind, values, generate):
+        key = cache_key(self.version, kind, values)
+        arrays = self.load(key)
+        if arrays is None:
+            arrays = generate()
+            self.store(key, arrays)
+        return arrays
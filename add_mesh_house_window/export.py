@@ -0,0 +1,192 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Export of generated windows straight to files, without Blender datablocks:
+#
+#   from add_mesh_house_window import export
+#   export.export_file(export.load_records("windows.json"), "windows.glb")
+#
+# Every record is (name, parameters, level of detail). Records with identical
+# parameters share one geometry: OBJ objects reference the same vertex block,
+# glTF nodes the same mesh. Geometry is written as soon as it is generated, so
+# only the keys of written geometries (and for glTF the small JSON part) stay in
+# memory. Like geometry, this module must not import bpy.
+
+import csv
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+from . import bl_info
+from .geometry import WINDOW_LODS, hw_parameter_key, hw_plugin_parameters, window_arrays
+
+DEFAULTS = {
+    "pp_Width": 1.0,
+    "pp_Height": 1.0,
+    "pp_Depth": 0.1,
+    "pp_FrameWidth": 0.1,
+}
+
+
+# JSON list of records or CSV file with a header line. Every record may contain
+# "name", the pp_* parameters and "lod", missing values use the operator defaults
+def load_records(filepath):
+    if filepath.lower().endswith(".json"):
+        with open(filepath) as f:
+            rows = json.load(f)
+    else:
+        with open(filepath, newline='') as f:
+            rows = list(csv.DictReader(f))
+
+    records = []
+    for index, row in enumerate(rows):
+        name = row.get("name") or "house_window_%05d" % index
+        params = [float(row.get(prm) or DEFAULTS[prm]) for prm in hw_plugin_parameters()]
+        lod = row.get("lod") or "simple"
+        if lod not in WINDOW_LODS:
+            raise ValueError("Record %s: unknown level of detail %r" % (name, lod))
+        records.append((name, params, lod))
+    return records
+
+
+# Geometry of records, each distinct parameter key generated once:
+# yields (name, key, arrays) where arrays is None if the key was seen before
+def unique_geometry(records):
+    seen = set()
+    for name, params, lod in records:
+        key = hw_parameter_key(params, lod)
+        if key in seen:
+            yield name, key, None
+            continue
+        seen.add(key)
+        yield name, key, window_arrays(*params, variant=lod)
+
+
+def write_obj(filepath, name, coords, vertex_indices, loop_starts, loop_totals):
+    with open(filepath, "w") as f:
+        f.write("o %s\n" % name)
+        for i in range(0, len(coords), 3):
+            f.write("v %.6f %.6f %.6f\n" % (coords[i], coords[i + 1], coords[i + 2]))
+        for start, total in zip(loop_starts, loop_totals):
+            f.write("f %s\n" % " ".join(str(v + 1) for v in vertex_indices[start:start + total]))
+
+
+# One OBJ file, one object per record. Vertices of every distinct geometry are
+# written once, objects of identical windows index the same vertices
+def export_obj(records, filepath):
+    offsets = {}
+    vertex_count = 0
+    with open(filepath, "w") as f:
+        f.write("# %s %d.%d.%d\n" % ((bl_info["name"],) + tuple(bl_info["version"])))
+        for name, key, arrays in unique_geometry(records):
+            if arrays is not None:
+                coords, vertex_indices, loop_starts, loop_totals = arrays
+                offsets[key] = (vertex_count, vertex_indices, loop_starts, loop_totals)
+                f.writelines("v %.6f %.6f %.6f\n" % (coords[i], coords[i + 1], coords[i + 2])
+                             for i in range(0, len(coords), 3))
+                vertex_count += len(coords) // 3
+
+            first, vertex_indices, loop_starts, loop_totals = offsets[key]
+            f.write("o %s\n" % name)
+            f.writelines("f %s\n" % " ".join(str(first + v + 1) for v in vertex_indices[start:start + total])
+                         for start, total in zip(loop_starts, loop_totals))
+
+
+def _little_endian(values):
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+# Binary glTF, one node per record and one mesh per distinct geometry. Buffer data
+# is streamed to a temporary file while the JSON part is collected, both are
+# joined at the end because the GLB header needs their lengths
+def export_glb(records, filepath):
+    meshes = {}
+    gltf = {
+        "asset": {"version": "2.0", "generator": "%s %d.%d.%d" % ((bl_info["name"],) + tuple(bl_info["version"]))},
+        "scene": 0,
+        "scenes": [{"nodes": []}],
+        "nodes": [],
+        "meshes": [],
+        # Window faces are not consistently wound, like Blender's exporter with
+        # backface culling off the material is double sided
+        "materials": [{"name": "House Window", "doubleSided": True}],
+        "accessors": [],
+        "bufferViews": [],
+        "buffers": [],
+    }
+
+    def add_view(binary, values, target):
+        data = _little_endian(values).tobytes()
+        gltf["bufferViews"].append({"buffer": 0, "byteOffset": binary.tell(), "byteLength": len(data),
+                                    "target": target})
+        binary.write(data)
+        return len(gltf["bufferViews"]) - 1
+
+    with tempfile.TemporaryFile() as binary:
+        for name, key, arrays in unique_geometry(records):
+            if arrays is not None:
+                coords, vertex_indices, loop_starts, loop_totals = arrays
+
+                # Blender is Z up, glTF Y up
+                positions = array('f')
+                for i in range(0, len(coords), 3):
+                    positions.extend((coords[i], coords[i + 2], -coords[i + 1]))
+
+                # Window faces are convex, fans are enough
+                triangles = array('I')
+                for start, total in zip(loop_starts, loop_totals):
+                    first = vertex_indices[start]
+                    for k in range(start + 1, start + total - 1):
+                        triangles.extend((first, vertex_indices[k], vertex_indices[k + 1]))
+
+                accessors = gltf["accessors"]
+                accessors.append({"bufferView": add_view(binary, positions, 34962), "componentType": 5126,
+                                  "count": len(positions) // 3, "type": "VEC3",
+                                  "min": [min(positions[k::3]) for k in range(3)],
+                                  "max": [max(positions[k::3]) for k in range(3)]})
+                accessors.append({"bufferView": add_view(binary, triangles, 34963), "componentType": 5125,
+                                  "count": len(triangles), "type": "SCALAR"})
+
+                meshes[key] = len(gltf["meshes"])
+                gltf["meshes"].append({"name": name, "primitives": [{"attributes": {"POSITION": len(accessors) - 2},
+                                                                     "indices": len(accessors) - 1,
+                                                                     "material": 0}]})
+
+            gltf["scenes"][0]["nodes"].append(len(gltf["nodes"]))
+            gltf["nodes"].append({"name": name, "mesh": meshes[key]})
+
+        binary_length = binary.tell()
+        binary.write(b"\0" * (-binary_length % 4))
+        padded_binary_length = binary.tell()
+        gltf["buffers"].append({"byteLength": binary_length})
+
+        json_chunk = json.dumps(gltf, separators=(",", ":")).encode()
+        json_chunk += b" " * (-len(json_chunk) % 4)
+
+        with open(filepath, "wb") as f:
+            f.write(struct.pack("<4sII", b"glTF", 2, 12 + 8 + len(json_chunk) + 8 + padded_binary_length))
+            f.write(struct.pack("<I4s", len(json_chunk), b"JSON"))
+            f.write(json_chunk)
+            f.write(struct.pack("<I4s", padded_binary_length, b"BIN\0"))
+            binary.seek(0)
+            shutil.copyfileobj(binary, f)
+
+
+EXPORTERS = {
+    ".obj": export_obj,
+    ".glb": export_glb,
+}
+
+
+# Exporter chosen by file extension
+def export_file(records, filepath):
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension not in EXPORTERS:
+        raise ValueError("Unsupported export format %r (use %s)" % (extension, ", ".join(sorted(EXPORTERS))))
+    EXPORTERS[extension](records, filepath)
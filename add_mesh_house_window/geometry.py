@@ -0,0 +1,468 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# House window geometry as plain arrays. This module must not import bpy,
+# so it can be used and profiled outside of Blender.
+
+from array import array
+from bisect import bisect_left
+
+
+# Collects faces while welding vertices closer than tolerance. Vertices are found
+# through a hash of their quantized coordinates and faces through their sorted
+# vertex indices, so every added face costs O(corners) instead of a full scan.
+# Copied into blender_add_mesh_plugin.py, keep both in step.
+class MeshBuilder:
+
+    def __init__(self, tolerance=1e-6):
+        self.tolerance = tolerance
+        self._scale = 1.0 / tolerance if tolerance > 0 else None
+
+        # Flat buffers: xyz per vertex, vertex indices per loop, corners per face
+        self.coords = array('f')
+        self.vertex_indices = array('i')
+        self.loop_totals = array('i')
+
+        self._vertex_lookup = {}
+        self._face_keys = set()
+
+    @property
+    def vertex_count(self):
+        return len(self.coords) // 3
+
+    @property
+    def face_count(self):
+        return len(self.loop_totals)
+
+    def vertex_key(self, co):
+        x, y, z = co
+        if self._scale is None:
+            return x, y, z
+        return round(x * self._scale), round(y * self._scale), round(z * self._scale)
+
+    # Return index of vertex at co, adding it if no vertex is there yet
+    def add_vertex(self, co):
+        key = self.vertex_key(co)
+        index = self._vertex_lookup.get(key)
+        if index is None:
+            index = len(self.coords) // 3
+            self._vertex_lookup[key] = index
+            self.coords.extend(co)
+        return index
+
+    # Add face without duplicates
+    def add_face(self, vectors):
+        v_index = [self.add_vertex(v) for v in vectors]
+
+        face_key = tuple(sorted(v_index))
+        if face_key in self._face_keys:
+            return "DUPLICATE"
+        self._face_keys.add(face_key)
+
+        self.vertex_indices.extend(v_index)
+        self.loop_totals.append(len(v_index))
+        return "SUCCESS"
+
+    def loop_starts(self):
+        starts = array('i', bytes(4 * len(self.loop_totals)))
+        total = 0
+        for i, count in enumerate(self.loop_totals):
+            starts[i] = total
+            total += count
+        return starts
+
+    # Flat arrays: coords (float32), vertex_indices, loop_starts, loop_totals (int32)
+    def to_arrays(self):
+        return self.coords, self.vertex_indices, self.loop_starts(), self.loop_totals
+
+
+# Window corner coordinates are linear in (Width, Height, Depth, FrameWidth),
+# every axis below is a tuple of coefficients for those four parameters
+_O = (0, 0, 0, 0)
+_W = (1, 0, 0, 0)
+_H = (0, 1, 0, 0)
+_D = (0, 0, 1, 0)
+_F = (0, 0, 0, 1)
+_W_F = (1, 0, 0, -1)
+_H_F = (0, 1, 0, -1)
+
+WINDOW_VARIANTS = {
+    "simple": [
+        # Front
+        [(_O, _O, _O), (_W, _O, _O), (_W_F, _O, _F), (_F, _O, _F)],
+        [(_O, _O, _H), (_W, _O, _H), (_W_F, _O, _H_F), (_F, _O, _H_F)],
+        [(_O, _O, _O), (_F, _O, _F), (_F, _O, _H_F), (_O, _O, _H)],
+        [(_W_F, _O, _F), (_W, _O, _O), (_W, _O, _H), (_W_F, _O, _H_F)],
+
+        # Back
+        [(_O, _D, _O), (_W, _D, _O), (_W_F, _D, _F), (_F, _D, _F)],
+        [(_O, _D, _H), (_W, _D, _H), (_W_F, _D, _H_F), (_F, _D, _H_F)],
+        [(_O, _D, _O), (_F, _D, _F), (_F, _D, _H_F), (_O, _D, _H)],
+        [(_W_F, _D, _F), (_W, _D, _O), (_W, _D, _H), (_W_F, _D, _H_F)],
+
+        # Depth fill
+        [(_O, _D, _O), (_O, _O, _O), (_O, _O, _H), (_O, _D, _H)],
+        [(_O, _D, _O), (_O, _O, _O), (_W, _O, _O), (_W, _D, _O)],
+        [(_W, _D, _O), (_W, _O, _O), (_W, _O, _H), (_W, _D, _H)],
+        [(_O, _D, _H), (_O, _O, _H), (_W, _O, _H), (_W, _D, _H)],
+
+        [(_F, _D, _F), (_F, _O, _F), (_F, _O, _H_F), (_F, _D, _H_F)],
+        [(_F, _D, _F), (_F, _O, _F), (_W_F, _O, _F), (_W_F, _D, _F)],
+        [(_W_F, _D, _F), (_W_F, _O, _F), (_W_F, _O, _H_F), (_W_F, _D, _H_F)],
+        [(_F, _D, _H_F), (_F, _O, _H_F), (_W_F, _O, _H_F), (_W_F, _D, _H_F)],
+    ],
+}
+
+
+def _axis(w=0, h=0, d=0, f=0):
+    return w, h, d, f
+
+
+# Quads of an axis aligned box, sides are picked from "-x", "+x", "-y", "+y", "-z", "+z"
+def _box(x0, x1, y0, y1, z0, z1, sides=("-x", "+x", "-y", "+y", "-z", "+z")):
+    quads = {
+        "-z": [(x0, y0, z0), (x0, y1, z0), (x1, y1, z0), (x1, y0, z0)],
+        "+z": [(x0, y0, z1), (x1, y0, z1), (x1, y1, z1), (x0, y1, z1)],
+        "-y": [(x0, y0, z0), (x1, y0, z0), (x1, y0, z1), (x0, y0, z1)],
+        "+y": [(x0, y1, z0), (x0, y1, z1), (x1, y1, z1), (x1, y1, z0)],
+        "-x": [(x0, y0, z0), (x0, y0, z1), (x0, y1, z1), (x0, y1, z0)],
+        "+x": [(x1, y0, z0), (x1, y1, z0), (x1, y1, z1), (x1, y0, z1)],
+    }
+    return [quads[side] for side in sides]
+
+
+# Levels of detail, all generated from the same four parameters:
+# "proxy" is a plain box, "detailed" adds a mullion cross, a glass pane and a sill
+WINDOW_VARIANTS["proxy"] = _box(_O, _W, _O, _D, _O, _H)
+
+WINDOW_VARIANTS["detailed"] = (
+    WINDOW_VARIANTS["simple"]
+    # Vertical and horizontal mullion, ends hidden in the frame
+    + _box(_axis(w=0.5, f=-0.25), _axis(w=0.5, f=0.25), _axis(d=0.3), _axis(d=0.7), _F, _H_F,
+           sides=("-x", "+x", "-y", "+y"))
+    + _box(_F, _W_F, _axis(d=0.3), _axis(d=0.7), _axis(h=0.5, f=-0.25), _axis(h=0.5, f=0.25),
+           sides=("-y", "+y", "-z", "+z"))
+    # Glass pane in the middle of the frame depth
+    + [[(_F, _axis(d=0.5), _F), (_W_F, _axis(d=0.5), _F),
+        (_W_F, _axis(d=0.5), _H_F), (_F, _axis(d=0.5), _H_F)]]
+    # Sill under the window, sticking out at the front (-y) and both sides
+    + _box(_axis(f=-0.5), _axis(w=1, f=0.5), _axis(f=-1), _D, _axis(f=-0.5), _O)
+)
+
+WINDOW_LODS = ("detailed", "simple", "proxy")
+
+
+# Topology of a window variant is built (and deduplicated) only once,
+# afterwards every parameter change just evaluates the corner formulas
+class WindowTemplate:
+    # Generic parameters used to weld corners; no two different corners coincide here
+    probe = (1.0, 1.37, 0.19, 0.11)
+
+    def __init__(self, faces):
+        builder = MeshBuilder()
+        corners = []
+
+        for face in faces:
+            vectors = []
+            for corner in face:
+                co = self.evaluate(corner, self.probe)
+                if builder.add_vertex(co) == len(corners):
+                    corners.append(corner)
+                vectors.append(co)
+            builder.add_face(vectors)
+
+        # Shared by every mesh built from this template, never modify them
+        self.vertex_indices = builder.vertex_indices
+        self.loop_starts = builder.loop_starts()
+        self.loop_totals = builder.loop_totals
+
+        # One row of coefficients per vertex coordinate
+        self.rows = [axis for corner in corners for axis in corner]
+
+    @staticmethod
+    def evaluate(corner, params):
+        return tuple(sum(c * p for c, p in zip(axis, params)) for axis in corner)
+
+    def coordinates(self, width, height, depth, frame_width):
+        return array('f', [w * width + h * height + d * depth + f * frame_width
+                           for w, h, d, f in self.rows])
+
+    # Same flat arrays as MeshBuilder.to_arrays
+    def build(self, width, height, depth, frame_width):
+        return (self.coordinates(width, height, depth, frame_width),
+                self.vertex_indices, self.loop_starts, self.loop_totals)
+
+
+_window_templates = {}
+
+
+def window_template(variant="simple"):
+    template = _window_templates.get(variant)
+    if template is None:
+        template = _window_templates[variant] = WindowTemplate(WINDOW_VARIANTS[variant])
+    return template
+
+
+def clamp_frame_width(width, height, frame_width):
+    # Frame width should be two times smaller than window width
+    if frame_width * 2 > width:
+        frame_width = width / 2 - 0.0001
+
+    if frame_width * 2 > height:
+        frame_width = height / 2 - 0.0001
+
+    return frame_width
+
+
+# Flat window arrays for given parameters, usable without an operator
+def window_arrays(width, height, depth, frame_width, variant="simple"):
+    frame_width = clamp_frame_width(width, height, frame_width)
+    return window_template(variant).build(width, height, depth, frame_width)
+
+
+# Apply every placement matrix to the same geometry and concatenate the copies
+# into one set of flat arrays. With first > 0 indices continue after that many
+# copies, so arrays tiled in chunks can simply be joined
+def tile_mesh_arrays(coords, vertex_indices, loop_starts, loop_totals, matrices, first=0):
+    vertex_count = len(coords) // 3
+    loop_count = len(vertex_indices)
+    points = [tuple(coords[i:i + 3]) for i in range(0, len(coords), 3)]
+
+    tiled_coords = array('f')
+    for m in matrices:
+        (ax, ay, az, at), (bx, by, bz, bt), (cx, cy, cz, ct) = m[0], m[1], m[2]
+        tiled_coords.extend([v for x, y, z in points
+                             for v in (ax * x + ay * y + az * z + at,
+                                       bx * x + by * y + bz * z + bt,
+                                       cx * x + cy * y + cz * z + ct)])
+
+    copies = range(first, first + len(matrices))
+    tiled_indices = array('i', [i + n * vertex_count for n in copies for i in vertex_indices])
+    tiled_starts = array('i', [start + n * loop_count for n in copies for start in loop_starts])
+    tiled_totals = loop_totals * len(matrices)
+
+    return tiled_coords, tiled_indices, tiled_starts, tiled_totals
+
+
+def join_mesh_arrays(chunks):
+    joined = (array('f'), array('i'), array('i'), array('i'))
+    for chunk in chunks:
+        for target, source in zip(joined, chunk):
+            target.extend(source)
+    return joined
+
+
+# Oriented box of a window (0..width, 0..depth, 0..height) under a placement matrix:
+# center, unit axes and half extents along them
+def placement_box(matrix, width, depth, height):
+    rows = matrix[0], matrix[1], matrix[2]
+    half = (width / 2, depth / 2, height / 2)
+    center = tuple(r[0] * half[0] + r[1] * half[1] + r[2] * half[2] + r[3] for r in rows)
+
+    axes = []
+    extents = []
+    for j in range(3):
+        column = (rows[0][j], rows[1][j], rows[2][j])
+        length = (column[0] ** 2 + column[1] ** 2 + column[2] ** 2) ** 0.5
+        axes.append(tuple(c / length for c in column) if length > 0 else (0.0, 0.0, 0.0))
+        extents.append(half[j] * length)
+    return center, axes, extents
+
+
+# Separating axis test of two oriented boxes. Boxes only touching each other
+# (penetration up to tolerance) do not overlap
+def boxes_overlap(box_a, box_b, tolerance=1e-6):
+    ca, a, ea = box_a
+    cb, b, eb = box_b
+    t = (cb[0] - ca[0], cb[1] - ca[1], cb[2] - ca[2])
+
+    def dot(u, v):
+        return u[0] * v[0] + u[1] * v[1] + u[2] * v[2]
+
+    r = [[dot(a[i], b[j]) for j in range(3)] for i in range(3)]
+    abs_r = [[abs(v) + 1e-9 for v in row] for row in r]
+    ta = [dot(t, a[i]) for i in range(3)]
+
+    for i in range(3):
+        if abs(ta[i]) >= ea[i] + sum(eb[j] * abs_r[i][j] for j in range(3)) - tolerance:
+            return False
+    for j in range(3):
+        if abs(dot(t, b[j])) >= sum(ea[i] * abs_r[i][j] for i in range(3)) + eb[j] - tolerance:
+            return False
+
+    # Axes a[i] x b[j], skipped for parallel edges where the cross product vanishes
+    for i in range(3):
+        i1, i2 = (i + 1) % 3, (i + 2) % 3
+        for j in range(3):
+            length = max(0.0, 1.0 - r[i][j] ** 2) ** 0.5
+            if length < 1e-6:
+                continue
+            j1, j2 = (j + 1) % 3, (j + 2) % 3
+            distance = abs(ta[i2] * r[i1][j] - ta[i1] * r[i2][j])
+            radius = (ea[i1] * abs_r[i2][j] + ea[i2] * abs_r[i1][j] +
+                      eb[j1] * abs_r[i][j2] + eb[j2] * abs_r[i][j1])
+            if distance >= radius - tolerance * length:
+                return False
+    return True
+
+
+# Pairs (i, j), i < j, of overlapping windows. Axis aligned bounds of every window
+# go into a uniform grid, so only windows sharing a cell are tested exactly and
+# the cost grows with the number of placements instead of its square
+def find_overlaps(matrices, width, depth, height, tolerance=1e-6):
+    half = (width / 2, depth / 2, height / 2)
+
+    bounds = []
+    # Windows not rotated (or rotated by multiples of 90 degrees) fill their bounds
+    aligned = []
+    for m in matrices:
+        box = []
+        nonzero = 0
+        for row in (m[0], m[1], m[2]):
+            center = row[0] * half[0] + row[1] * half[1] + row[2] * half[2] + row[3]
+            reach = abs(row[0]) * half[0] + abs(row[1]) * half[1] + abs(row[2]) * half[2]
+            box.append((center - reach + tolerance, center + reach - tolerance))
+            nonzero += (row[0] != 0) + (row[1] != 0) + (row[2] != 0)
+        bounds.append(box)
+        aligned.append(nonzero == 3)
+    if not bounds:
+        return []
+
+    # Cells about the size of an average window
+    cell = sum(max(hi - lo for lo, hi in box) for box in bounds) / len(bounds)
+    if cell <= 0:
+        cell = 1.0
+
+    grid = {}
+    boxes = {}
+    overlaps = []
+    for i, ((x0, x1), (y0, y1), (z0, z1)) in enumerate(bounds):
+        cells = [(x, y, z) for x in range(int(x0 // cell), int(x1 // cell) + 1)
+                 for y in range(int(y0 // cell), int(y1 // cell) + 1)
+                 for z in range(int(z0 // cell), int(z1 // cell) + 1)]
+
+        candidates = set()
+        for key in cells:
+            found = grid.get(key)
+            if found is not None:
+                candidates.update(found)
+                found.append(i)
+            else:
+                grid[key] = [i]
+
+        for j in sorted(candidates):
+            (a0, a1), (b0, b1), (c0, c1) = bounds[j]
+            if x0 < a1 and a0 < x1 and y0 < b1 and b0 < y1 and z0 < c1 and c0 < z1:
+                if aligned[i] and aligned[j]:
+                    overlaps.append((j, i))
+                    continue
+
+                # Exact test only for the few rotated windows with overlapping bounds
+                for k in (i, j):
+                    if k not in boxes:
+                        boxes[k] = placement_box(matrices[k], width, depth, height)
+                if boxes_overlap(boxes[j], boxes[i], tolerance):
+                    overlaps.append((j, i))
+    return overlaps
+
+
+# Indices of windows to keep when every window overlapping an earlier kept one is dropped
+def non_overlapping(count, overlaps):
+    dropped = set()
+    for i, j in sorted(overlaps, key=lambda pair: (pair[1], pair[0])):
+        if i not in dropped:
+            dropped.add(j)
+    return [i for i in range(count) if i not in dropped]
+
+
+# Locations of placements with X and Z snapped to a wall grid of given step
+def snapped_locations(matrices, step):
+    locations = []
+    for m in matrices:
+        x, y, z = m[0][3], m[1][3], m[2][3]
+        locations.append((round(x / step) * step, y, round(z / step) * step))
+    return locations
+
+
+# Openings (x, z, width, height) of a window grid in a wall, centered horizontally,
+# the lowest row starting at sill_height
+def grid_openings(wall_width, rows, columns, width, height, column_spacing, row_spacing, sill_height):
+    left = (wall_width - columns * width - (columns - 1) * column_spacing) / 2
+    return [(left + column * (width + column_spacing), sill_height + row * (height + row_spacing), width, height)
+            for row in range(rows) for column in range(columns)]
+
+
+# Wall in the XZ plane (front at y = 0, back at y = thickness) with rectangular
+# openings (x, z, width, height) already cut out, matching windows placed at (x, 0, z).
+# The wall is split along every opening edge into a grid, solid cells become front
+# and back faces and every border between a solid and an empty cell becomes a
+# reveal face, so the result is closed and needs no Boolean modifiers.
+# Raises ValueError for openings outside the wall or overlapping each other
+def wall_arrays(width, height, thickness, openings):
+    xs = {0.0, float(width)}
+    zs = {0.0, float(height)}
+    for x, z, w, h in openings:
+        if w <= 0 or h <= 0:
+            raise ValueError("Opening at (%g, %g) has no area" % (x, z))
+        if x < 0 or z < 0 or x + w > width or z + h > height:
+            raise ValueError("Opening at (%g, %g) does not fit into the wall" % (x, z))
+        xs.update((x, x + w))
+        zs.update((z, z + h))
+    xs = sorted(xs)
+    zs = sorted(zs)
+
+    solid = [[True] * (len(xs) - 1) for _ in range(len(zs) - 1)]
+    for x, z, w, h in openings:
+        for j in range(bisect_left(zs, z), bisect_left(zs, z + h)):
+            row = solid[j]
+            for i in range(bisect_left(xs, x), bisect_left(xs, x + w)):
+                if not row[i]:
+                    raise ValueError("Opening at (%g, %g) overlaps another opening" % (x, z))
+                row[i] = False
+
+    def is_solid(i, j):
+        return 0 <= j < len(solid) and 0 <= i < len(solid[j]) and solid[j][i]
+
+    t = thickness
+    builder = MeshBuilder()
+    for j in range(len(zs) - 1):
+        z0, z1 = zs[j], zs[j + 1]
+        for i in range(len(xs) - 1):
+            x0, x1 = xs[i], xs[i + 1]
+            if solid[j][i]:
+                builder.add_face([(x0, 0, z0), (x1, 0, z0), (x1, 0, z1), (x0, 0, z1)])
+                builder.add_face([(x0, t, z1), (x1, t, z1), (x1, t, z0), (x0, t, z0)])
+
+    # Reveals facing +X / -X, between cells i - 1 and i
+    for j in range(len(zs) - 1):
+        z0, z1 = zs[j], zs[j + 1]
+        for i in range(len(xs)):
+            left, right = is_solid(i - 1, j), is_solid(i, j)
+            if left != right:
+                face = [(xs[i], 0, z0), (xs[i], 0, z1), (xs[i], t, z1), (xs[i], t, z0)]
+                builder.add_face(face[::-1] if left else face)
+
+    # Reveals facing +Z / -Z, between cells j - 1 and j
+    for i in range(len(xs) - 1):
+        x0, x1 = xs[i], xs[i + 1]
+        for j in range(len(zs)):
+            below, above = is_solid(i, j - 1), is_solid(i, j)
+            if below != above:
+                face = [(x0, 0, zs[j]), (x1, 0, zs[j]), (x1, t, zs[j]), (x0, t, zs[j])]
+                builder.add_face(face if below else face[::-1])
+
+    return builder.to_arrays()
+
+
+# Key of one window mesh: rounded parameters followed by the level of detail
+def hw_parameter_key(values, lod="simple"):
+    return tuple(round(float(v), 6) for v in values) + (lod,)
+
+
+def hw_plugin_parameters():
+    pl_params = [
+        "pp_Width",
+        "pp_Height",
+        "pp_Depth",
+        "pp_FrameWidth"
+    ]
+    return pl_params
@@ -0,0 +1,1622 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Blender side of the house window add-on: operators, menus and mesh datablocks.
+# Geometry itself is generated by the bpy-free geometry module.
+
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import time
+from array import array
+
+import bpy
+import bmesh
+from bpy.types import AddonPreferences, Operator
+from bpy.app.handlers import persistent
+from bpy.props import (
+    FloatProperty,
+    IntProperty,
+    EnumProperty,
+    StringProperty,
+    PointerProperty,
+    BoolProperty,
+)
+from bpy_extras import object_utils
+from mathutils import Euler, Matrix, Vector
+from bpy_extras.object_utils import AddObjectHelper
+
+from . import bl_info, profiling
+from .diskcache import GeometryCache, matrices_digest
+from .geometry import (
+    clamp_frame_width,
+    find_overlaps,
+    grid_openings,
+    hw_parameter_key,
+    hw_plugin_parameters,
+    join_mesh_arrays,
+    non_overlapping,
+    snapped_locations,
+    tile_mesh_arrays,
+    wall_arrays,
+    window_arrays,
+)
+
+
+# Helpers from mesh_from_arrays to clear_vertex_groups are copied into
+# blender_add_mesh_plugin.py, keep both in step
+
+# Fill an empty mesh from flat buffers (array.array or NumPy, float32 coords and
+# int32 indices) with bulk foreach_set calls instead of from_pydata
+def mesh_from_arrays(mesh, coords, vertex_indices, loop_starts, loop_totals):
+    mesh.vertices.add(len(coords) // 3)
+    mesh.loops.add(len(vertex_indices))
+    mesh.polygons.add(len(loop_totals))
+
+    mesh.vertices.foreach_set("co", coords)
+    mesh.loops.foreach_set("vertex_index", vertex_indices)
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    # Newer Blender versions derive loop_total from loop_start and make it read only
+    if not mesh.polygons.bl_rna.properties["loop_total"].is_readonly:
+        mesh.polygons.foreach_set("loop_total", loop_totals)
+
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+# Rewrite geometry of an existing mesh in place, leaving materials etc. untouched.
+# When topology is unchanged only vertex coordinates are written.
+# Returns True when topology had to be rebuilt
+def update_mesh_arrays(mesh, coords, vertex_indices, loop_starts, loop_totals):
+    if len(mesh.vertices) * 3 == len(coords) and len(mesh.polygons) == len(loop_totals) \
+            and len(mesh.loops) == len(vertex_indices):
+        mesh.vertices.foreach_set("co", coords)
+        mesh.update()
+        return False
+
+    if hasattr(mesh, "clear_geometry"):
+        mesh.clear_geometry()
+    else:
+        # Blender 2.80 has no clear_geometry, empty bmesh does the same
+        bm = bmesh.new()
+        bm.to_mesh(mesh)
+        bm.free()
+
+    mesh_from_arrays(mesh, coords, vertex_indices, loop_starts, loop_totals)
+    return True
+
+
+# Append flat buffers to an edit mode bmesh. Written straight into the bmesh,
+# so no temporary mesh datablock is created. Returns the new faces
+def bmesh_add_arrays(bm, coords, vertex_indices, loop_starts, loop_totals):
+    new_vert = bm.verts.new
+    new_face = bm.faces.new
+    verts = [new_vert(coords[i:i + 3]) for i in range(0, len(coords), 3)]
+    return [new_face([verts[i] for i in vertex_indices[start:start + total]])
+            for start, total in zip(loop_starts, loop_totals)]
+
+
+# Shading choices of a mesh that survive regeneration
+def mesh_shading(mesh):
+    use_smooth = len(mesh.polygons) > 0 and mesh.polygons[0].use_smooth
+    return bool(mesh.use_auto_smooth), bool(use_smooth)
+
+
+# Restore flat/smooth choice with one bulk write instead of bpy.ops.object.shade_smooth,
+# so neither selection nor active object matter
+def restore_shading(mesh, shading):
+    use_auto_smooth, use_smooth = shading
+    mesh.use_auto_smooth = use_auto_smooth
+    mesh.polygons.foreach_set("use_smooth", [use_smooth] * len(mesh.polygons))
+
+
+# Data API replacement for bpy.ops.object.vertex_group_remove(all=True)
+def clear_vertex_groups(objects):
+    for obj in objects:
+        obj.vertex_groups.clear()
+
+
+def placement_matrix(location, rotation=(0, 0, 0), scale=(1, 1, 1)):
+    return Matrix.Translation(location) @ Euler(rotation).to_matrix().to_4x4() @ Matrix.Diagonal(scale).to_4x4()
+
+
+# Window centered on a face: width along the face horizontally, height upwards
+# and depth going into the face (opposite to its normal)
+def face_window_matrix(center, normal, width, height):
+    y_axis = -normal.normalized()
+    x_axis = y_axis.cross(Vector((0, 0, 1)))
+    if x_axis.length < 1e-6:
+        # Horizontal face, keep width along X
+        x_axis = Vector((1, 0, 0))
+    x_axis.normalize()
+    z_axis = x_axis.cross(y_axis)
+
+    matrix = Matrix((x_axis, y_axis, z_axis)).transposed().to_4x4()
+    matrix.translation = center - x_axis * (width / 2) - z_axis * (height / 2)
+    return matrix
+
+
+# Windows lie in the XZ plane, grid goes along X (columns) and Z (rows)
+def grid_window_placements(rows, columns, step_x, step_z):
+    return [Matrix.Translation((column * step_x, 0, row * step_z))
+            for row in range(rows) for column in range(columns)]
+
+
+# JSON: list of {"location": [x, y, z], "rotation": [rx, ry, rz], "scale": [sx, sy, sz]}
+# CSV: x, y, z[, rx, ry, rz[, sx, sy, sz]] per line, header line is skipped
+# Rotations are XYZ Euler angles in radians
+def load_window_placements(filepath):
+    placements = []
+
+    if filepath.lower().endswith(".json"):
+        with open(filepath) as f:
+            for record in json.load(f):
+                placements.append(placement_matrix(record["location"],
+                                                   record.get("rotation", (0, 0, 0)),
+                                                   record.get("scale", (1, 1, 1))))
+        return placements
+
+    with open(filepath, newline='') as f:
+        for row in csv.reader(f):
+            try:
+                values = [float(v) for v in row]
+            except ValueError:
+                continue    # Header
+            if len(values) < 3:
+                continue
+            placements.append(placement_matrix(values[0:3], values[3:6] or (0, 0, 0), values[6:9] or (1, 1, 1)))
+
+    return placements
+
+
+def non_uniform_scale(placement, tolerance=1e-6):
+    scale = [abs(v) for v in placement.to_scale()]
+    return max(scale) - min(scale) > tolerance * max(max(scale), 1.0)
+
+
+# Carrier geometry for face instancing: one square per placement centered at its
+# origin. Blender aligns an instance with the face normal (placement Z) and the
+# first face edge (placement X), and scales it by the square root of face area,
+# so the side length carries the (uniform) placement scale
+def instance_carrier_arrays(placements):
+    coords = array('f')
+    for placement in placements:
+        location, rotation, scale = placement.decompose()
+        half = abs(scale[0] * scale[1] * scale[2]) ** (1 / 3) / 2
+        axes = rotation.to_matrix()
+        x = axes.col[0] * half
+        y = axes.col[1] * half
+        for corner in (location - x - y, location + x - y, location + x + y, location - x + y):
+            coords.extend(corner)
+
+    count = len(placements)
+    return (coords,
+            array('i', range(4 * count)),
+            array('i', range(0, 4 * count, 4)),
+            array('i', [4]) * count)
+
+
+# Digest of vertex coordinates and face corners, tells generated geometry apart
+# from geometry edited by hand since
+def hw_geometry_digest(mesh):
+    coords = array('f', [0.0]) * (len(mesh.vertices) * 3)
+    vertex_indices = array('i', [0]) * len(mesh.loops)
+    mesh.vertices.foreach_get("co", coords)
+    mesh.loops.foreach_get("vertex_index", vertex_indices)
+    digest = hashlib.sha1(coords.tobytes())
+    digest.update(vertex_indices.tobytes())
+    return digest.hexdigest()
+
+
+# Remember that the current geometry was generated for given parameters
+def hw_mark_generated(mesh, params, lod="simple"):
+    mesh["generated"] = repr(hw_parameter_key(params, lod))
+    mesh["geometry"] = hw_geometry_digest(mesh)
+
+
+# Parameters are stored as ID properties, "generated" remembers which of them the
+# current geometry was built for, so live regeneration can tell edited meshes apart,
+# "geometry" whether the mesh still holds that geometry and may be shared
+def hw_store_parameters(mesh, params, lod="simple"):
+    mesh["houseWindow"] = True
+    mesh["change"] = False
+    for prm, value in zip(hw_plugin_parameters(), params):
+        mesh[prm] = value
+    mesh["lod"] = lod
+    hw_mark_generated(mesh, params, lod)
+
+
+# Parameter key stored on a single house window mesh, None for other meshes
+def hw_mesh_key(mesh):
+    if "houseWindow" not in mesh.keys():
+        return None
+    try:
+        return hw_parameter_key((mesh[prm] for prm in hw_plugin_parameters()), mesh.get("lod", "simple"))
+    except KeyError:
+        return None
+
+
+# Markers of meshes managed by this add-on: single windows, merged window arrays,
+# instance carriers and walls with window openings
+PLUGIN_MESH_KINDS = ("houseWindow", "houseWindowArray", "houseWindowInstances", "houseWindowWall")
+
+
+# (kind, parameter key) of a plugin mesh, None for other meshes.
+# Instance carriers have no parameters, their key is an empty tuple
+def hw_mesh_entry(mesh):
+    for kind in PLUGIN_MESH_KINDS:
+        if kind in mesh.keys():
+            try:
+                params = [mesh[prm] for prm in hw_plugin_parameters()]
+            except KeyError:
+                return kind, ()
+            return kind, hw_parameter_key(params, mesh.get("lod", "simple"))
+    return None
+
+
+# Index of every plugin mesh by kind and parameters, built with one scan of
+# bpy.data.meshes per file and then kept up to date incrementally: operators add
+# what they create, the depsgraph handler adds duplicated meshes, removed or
+# renamed meshes are dropped when a lookup finds them missing. Also serves
+# sharing, windows of identical size use one mesh datablock. Blender user count
+# acts as refcount: meshes nobody uses any more are removed by evict()
+#
+#   plugin_meshes.meshes("houseWindow")            every single window mesh
+#   plugin_meshes.meshes("houseWindow", key)       windows with given parameters
+#   plugin_meshes.keys("houseWindow")              distinct parameter keys
+class PluginMeshIndex:
+
+    def __init__(self):
+        self.entries = {}
+        self.names = {}
+        self.scanned = False
+
+    def clear(self):
+        self.entries.clear()
+        self.names.clear()
+        self.scanned = False
+
+    def scan(self):
+        self.entries.clear()
+        self.names.clear()
+        self.scanned = True
+        for mesh in bpy.data.meshes:
+            self.add(mesh)
+
+    def ensure_scanned(self):
+        if not self.scanned:
+            self.scan()
+
+    def add(self, mesh):
+        self.ensure_scanned()
+        self.discard(mesh.name)
+
+        entry = hw_mesh_entry(mesh)
+        if entry is not None:
+            self.entries[mesh.name] = entry
+            self.names.setdefault(entry, set()).add(mesh.name)
+
+    def discard(self, name):
+        entry = self.entries.pop(name, None)
+        if entry is not None:
+            names = self.names[entry]
+            names.discard(name)
+            if not names:
+                del self.names[entry]
+
+    def __contains__(self, mesh):
+        return mesh.name in self.entries
+
+    # Mesh of an index entry, None (and the entry dropped) if it is gone or changed
+    def valid_mesh(self, name, entry):
+        mesh = bpy.data.meshes.get(name)
+        if mesh is not None and hw_mesh_entry(mesh) == entry:
+            return mesh
+
+        self.discard(name)
+        if mesh is not None:
+            self.add(mesh)
+        return None
+
+    def meshes(self, kind="houseWindow", key=None):
+        self.ensure_scanned()
+        if key is not None:
+            entries = [(kind, key)]
+        else:
+            entries = [entry for entry in self.names if entry[0] == kind]
+
+        result = []
+        for entry in entries:
+            for name in list(self.names.get(entry, ())):
+                mesh = self.valid_mesh(name, entry)
+                if mesh is not None:
+                    result.append(mesh)
+        return result
+
+    def keys(self, kind="houseWindow"):
+        self.ensure_scanned()
+        return [key for entry_kind, key in self.names if entry_kind == kind]
+
+    # Mesh to share for given parameters and materials, None if there is none.
+    # Objects relinked to it keep their look: material slots must be the same
+    # and the geometry must still be the generated one, not edited by hand.
+    # Meshes saved before geometry digests were stored are never shared
+    def get(self, key, materials=(), kind="houseWindow"):
+        self.ensure_scanned()
+        entry = (kind, key)
+        materials = list(materials)
+        for name in list(self.names.get(entry, ())):
+            mesh = self.valid_mesh(name, entry)
+            if mesh is not None and not mesh.is_editmode and list(mesh.materials) == materials \
+                    and mesh.get("geometry") == hw_geometry_digest(mesh):
+                return mesh
+        return None
+
+    # Remove single window meshes without users and forget them
+    def evict(self):
+        self.ensure_scanned()
+        for name, entry in list(self.entries.items()):
+            if entry[0] != "houseWindow":
+                continue
+            mesh = self.valid_mesh(name, entry)
+            if mesh is not None and mesh.users == 0:
+                self.discard(name)
+                bpy.data.meshes.remove(mesh)
+
+
+plugin_meshes = PluginMeshIndex()
+
+
+# Mesh names are only meaningful within one file, undo may bring back meshes
+# removed since the scan
+@persistent
+def hw_load_post(dummy):
+    plugin_meshes.clear()
+
+
+class HouseWindowPreferences(AddonPreferences):
+    bl_idname = __package__
+
+    record_timings: BoolProperty(name='Record Timings',
+                                 default=False,
+                                 description='Record wall time per phase of every operator run '
+                                             '(see add_mesh_house_window.profiling.records())')
+
+    profile: BoolProperty(name='cProfile Dumps',
+                          default=False,
+                          description='Write a cProfile .prof file for every operator run')
+
+    profile_directory: StringProperty(name='Profile Directory',
+                                      subtype='DIR_PATH',
+                                      description='Where .prof files are written (temporary directory if empty)')
+
+    disk_cache: BoolProperty(name='Disk Cache',
+                             default=False,
+                             description='Keep merged window arrays and walls on disk and reuse them across sessions')
+
+    disk_cache_directory: StringProperty(name='Cache Directory',
+                                         subtype='DIR_PATH',
+                                         description='Where cached geometry is stored '
+                                                     '(house_window_cache in the temporary directory if empty)')
+
+    disk_cache_size: IntProperty(name='Cache Size (MB)',
+                                 default=64,
+                                 min=1,
+                                 description='Least recently used geometry is removed above this size')
+
+    live_update: BoolProperty(name='Live Regeneration',
+                              default=True,
+                              description='Regenerate windows when their stored pp_* properties are edited, '
+                                          'animated or driven')
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+
+        col.prop(self, 'record_timings')
+        col.prop(self, 'profile')
+        sub = col.column()
+        sub.enabled = self.profile
+        sub.prop(self, 'profile_directory')
+
+        col.prop(self, 'disk_cache')
+        sub = col.column()
+        sub.enabled = self.disk_cache
+        sub.prop(self, 'disk_cache_directory')
+        sub.prop(self, 'disk_cache_size')
+
+        col.prop(self, 'live_update')
+
+
+def addon_preferences(context):
+    addon = context.preferences.addons.get(__package__)
+    return addon.preferences if addon is not None else None
+
+
+def profile_directory(prefs):
+    return bpy.path.abspath(prefs.profile_directory) if prefs.profile_directory else tempfile.gettempdir()
+
+
+_disk_cache = None
+
+
+# Disk cache configured in preferences, None when it is switched off
+def disk_cache(context):
+    global _disk_cache
+
+    prefs = addon_preferences(context)
+    if prefs is None or not prefs.disk_cache:
+        return None
+
+    if prefs.disk_cache_directory:
+        directory = bpy.path.abspath(prefs.disk_cache_directory)
+    else:
+        directory = os.path.join(tempfile.gettempdir(), "house_window_cache")
+    max_bytes = prefs.disk_cache_size * 1024 * 1024
+
+    if _disk_cache is None or _disk_cache.directory != directory:
+        try:
+            _disk_cache = GeometryCache(directory, bl_info["version"], max_bytes)
+        except OSError:
+            return None
+    _disk_cache.max_bytes = max_bytes
+    return _disk_cache
+
+
+# Expensive geometry, loaded from the disk cache when it is enabled.
+# values are the inputs of generate() and form the cache key
+def cached_arrays(kind, values, generate):
+    cache = disk_cache(bpy.context)
+    if cache is None:
+        return generate()
+    return cache.arrays(kind, values, generate)
+
+
+# Levels of detail, identifiers are geometry.WINDOW_VARIANTS names
+LOD_ITEMS = (('detailed', "Detailed", "Frame with mullions, glass pane and sill"),
+             ('simple', "Medium", "Plain frame"),
+             ('proxy', "Proxy", "Box of window size"))
+
+
+# Window parameters shared by every operator generating house windows
+class HouseWindowParameters:
+    # Parameters of mesh for further adjustment
+    pp_Width: FloatProperty(attr='pp_Width',
+                            name='Width',
+                            default=1.0,
+                            min=0.001,
+                            description='Width of window')
+
+    pp_Height: FloatProperty(attr='pp_Height',
+                             name='Height',
+                             default=1.0,
+                             min=0.001,
+                             description='Height of window')
+
+    pp_Depth: FloatProperty(attr='pp_Depth',
+                            name='Depth',
+                            default=0.1,
+                            min=0.001,
+                            description='Depth of window')
+
+    pp_FrameWidth: FloatProperty(attr='pp_FrameWidth',
+                                 name='Frame Width',
+                                 default=0.1,
+                                 min=0.0001,
+                                 description='Frame width (FrameWidth * 2 < Width)')
+
+    lod: EnumProperty(name='Detail',
+                      items=LOD_ITEMS,
+                      default='simple',
+                      description='Level of detail of window geometry')
+
+    share_mesh: BoolProperty(name='Share Mesh',
+                             default=True,
+                             description='Reuse the mesh of existing windows with identical parameters')
+
+    def clamp_frame_width(self):
+        frame_width = clamp_frame_width(self.pp_Width, self.pp_Height, self.pp_FrameWidth)
+        if frame_width != self.pp_FrameWidth:
+            self.pp_FrameWidth = frame_width
+
+    def window_key(self):
+        self.clamp_frame_width()
+        return hw_parameter_key((getattr(self, prm) for prm in hw_plugin_parameters()), self.lod)
+
+    # Mesh with current parameters and given materials, None if sharing is off or there is none
+    def shared_window_mesh(self, materials=()):
+        return plugin_meshes.get(self.window_key(), materials) if self.share_mesh else None
+
+    def generate_window_model(self):
+        self.clamp_frame_width()
+        return window_arrays(self.pp_Width, self.pp_Height, self.pp_Depth, self.pp_FrameWidth, variant=self.lod)
+
+    # Windows tiled at every placement. Placements are part of the disk cache key
+    # as a digest, computed only with the cache enabled
+    def merged_window_arrays(self, placements, window=None):
+        def generate():
+            return tile_mesh_arrays(*(window or self.generate_window_model()), placements)
+
+        if disk_cache(bpy.context) is None:
+            return generate()
+        return cached_arrays("merged", (self.window_key(), matrices_digest(placements)), generate)
+
+    def draw_window_parameters(self, col):
+        col.prop(self, 'pp_Width')
+        col.separator()
+        col.prop(self, 'pp_Height')
+        col.separator()
+        col.prop(self, 'pp_Depth')
+        col.separator()
+        col.prop(self, 'pp_FrameWidth')
+        col.separator()
+        col.prop(self, 'lod')
+        col.separator()
+        col.prop(self, 'share_mesh')
+        col.separator()
+
+
+# Based on BoltFactory Plugin by Aaron Keith
+class AddHouseWindowMesh(Operator, AddObjectHelper, HouseWindowParameters):
+    bl_idname = "mesh.house_window"
+    bl_label = "Add House Window Object"
+    bl_description = "Add mesh"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # This can be useful if there will be few variants of objects
+    houseWindow: BoolProperty(name="houseWindow",
+                              default=True,
+                              description="houseWindow")
+    # Indicating change that must be applied to mesh
+    change: BoolProperty(name="Change",
+                         default=False,
+                         description="change Plugin parameters")
+
+    on_selected_faces: BoolProperty(name="On Selected Faces",
+                                    default=False,
+                                    description="Edit mode: insert one window centered on every selected face")
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+
+        self.draw_window_parameters(col)
+        if context.mode == "EDIT_MESH":
+            col.prop(self, 'on_selected_faces')
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene is not None
+
+    def invoke(self, context, event):
+        # Parameters of the changed window are read here, not for every draw of the context menu
+        obj = context.active_object
+        if self.change and obj is not None and obj.data is not None and 'houseWindow' in obj.data.keys():
+            mesh = lod_source(obj)
+            for prm in hw_plugin_parameters():
+                setattr(self, prm, mesh[prm])
+            self.lod = mesh.get("lod", "simple")
+        return self.execute(context)
+
+    def execute(self, context):
+        prefs = addon_preferences(context)
+        timer = profiling.start(self.bl_idname, prefs is not None and prefs.record_timings)
+
+        if prefs is not None and prefs.profile:
+            with profiling.profiled(self.bl_idname, profile_directory(prefs)):
+                result = self.run(context, timer)
+        else:
+            result = self.run(context, timer)
+
+        timer.finish()
+        return result
+
+    def run(self, context, timer):
+
+        if bpy.context.mode == "OBJECT":
+            if context.selected_objects != [] and context.active_object and \
+                    (context.active_object.data is not None) \
+                    and ('houseWindow' in context.active_object.data.keys()) \
+                    and self.change:
+
+                obj = context.active_object
+                lod_restore_source(obj)
+                with timer.phase("lookup"):
+                    mesh = self.shared_window_mesh(obj.data.materials)
+
+                if mesh is not None:
+                    # Identical window already exists, just link its mesh
+                    obj.data = mesh
+                else:
+                    # Other windows sharing this mesh keep their size
+                    if obj.data.users > 1:
+                        obj.data = obj.data.copy()
+
+                    # This will COPY and preserve smooth choices
+                    shading = mesh_shading(obj.data)
+
+                    with timer.phase("generate"):
+                        window = self.generate_window_model()
+                    timer.count(window)
+
+                    # Modify existing mesh data object by replacing geometry (but leaving materials etc)
+                    with timer.phase("upload"):
+                        update_mesh_arrays(obj.data, *window)
+
+                    # Preserve flat/smooth choice. New mesh is flat by default
+                    with timer.phase("shading"):
+                        restore_shading(obj.data, shading)
+
+                    with timer.phase("vertex_groups"):
+                        clear_vertex_groups([obj])
+
+                with timer.phase("evict"):
+                    plugin_meshes.evict()
+
+            else:
+                with timer.phase("lookup"):
+                    mesh = self.shared_window_mesh()
+                if mesh is None:
+                    with timer.phase("generate"):
+                        window = self.generate_window_model()
+                    timer.count(window)
+
+                    with timer.phase("upload"):
+                        mesh = bpy.data.meshes.new(name='House Window')
+                        mesh_from_arrays(mesh, *window)
+                        # mesh.validate()
+
+                with timer.phase("object_add"):
+                    obj = object_utils.object_data_add(context, mesh, operator=self)
+
+            hw_store_parameters(obj.data, [getattr(self, prm) for prm in hw_plugin_parameters()], self.lod)
+            plugin_meshes.add(obj.data)
+
+            # Window with automatic detail was changed through its source mesh
+            if "houseWindowLOD" in obj.keys():
+                lod_update_source(obj, context.scene)
+
+        if bpy.context.mode == "EDIT_MESH":
+            obj = context.edit_object
+            bm = bmesh.from_edit_mesh(obj.data)  # Access edit mode's mesh data
+
+            placements = self.edit_placements(context, obj, bm)
+            if not placements:
+                self.report({'WARNING'}, "No faces selected")
+                return {'CANCELLED'}
+
+            with timer.phase("generate"):
+                windows = tile_mesh_arrays(*self.generate_window_model(), placements)
+            timer.count(windows)
+
+            with timer.phase("edit_mesh"):
+                bmesh_add_arrays(bm, *windows)
+                bmesh.update_edit_mesh(obj.data)  # Flush changes (update edit mode's view)
+
+        return {'FINISHED'}
+
+    # Window matrices in local space of the edited object
+    def edit_placements(self, context, obj, bm):
+        if self.on_selected_faces:
+            return [face_window_matrix(face.calc_center_median(), face.normal, self.pp_Width, self.pp_Height)
+                    for face in bm.faces if face.select]
+
+        # 3D cursor or the location/rotation from the redo panel
+        return [obj.matrix_world.inverted() @ object_utils.add_object_align_init(context, self)]
+
+
+# Adds many windows in one operator call (single undo step) instead of
+# running mesh.house_window once per window
+class AddHouseWindowArray(Operator, AddObjectHelper, HouseWindowParameters):
+    bl_idname = "mesh.house_window_array"
+    bl_label = "Add House Window Array"
+    bl_description = "Add grid or list of house windows"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Modal mode: seconds of work per timer step and windows per chunk
+    time_budget = 0.05
+    chunk_size = 256
+
+    rows: IntProperty(name='Rows',
+                      default=1,
+                      min=1,
+                      description='Number of window rows')
+
+    columns: IntProperty(name='Columns',
+                         default=3,
+                         min=1,
+                         description='Number of window columns')
+
+    row_spacing: FloatProperty(name='Row Spacing',
+                               default=0.5,
+                               description='Gap between window rows')
+
+    column_spacing: FloatProperty(name='Column Spacing',
+                                  default=0.5,
+                                  description='Gap between window columns')
+
+    placements_file: StringProperty(name='Placements File',
+                                    subtype='FILE_PATH',
+                                    description='CSV or JSON file with window transforms (replaces grid)')
+
+    snap_step: FloatProperty(name='Snap to Grid',
+                             default=0.0,
+                             min=0.0,
+                             subtype='DISTANCE',
+                             description='Snap window locations (X and Z) to a wall grid of this step, 0 is off')
+
+    overlaps: EnumProperty(name='Overlaps',
+                           items=(('IGNORE', "Ignore", "Do not check windows for overlaps"),
+                                  ('REPORT', "Report", "Add all windows, warn about overlapping ones"),
+                                  ('SKIP', "Skip", "Leave out windows overlapping an earlier window"),
+                                  ('CANCEL', "Cancel", "Add nothing if any windows overlap")),
+                           default='REPORT',
+                           description='What to do with windows overlapping each other')
+
+    modal_threshold: IntProperty(name='Steps Above',
+                                 default=2000,
+                                 min=0,
+                                 description='Add more windows than this in steps with progress (Esc cancels)')
+
+    output: EnumProperty(name='Output',
+                         items=(('MERGED', "Merged Mesh", "One object containing all windows"),
+                                ('LINKED', "Linked Duplicates", "One object per window, all sharing a single mesh"),
+                                ('INSTANCED', "Instances", "One carrier object instancing a single window mesh "
+                                                           "on its faces")),
+                         default='MERGED',
+                         description='How windows are added to the scene')
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+
+        self.draw_window_parameters(col)
+        col.prop(self, 'output')
+        col.separator()
+        col.prop(self, 'placements_file')
+        col.separator()
+
+        sub = col.column()
+        sub.enabled = not self.placements_file
+        sub.prop(self, 'rows')
+        sub.prop(self, 'columns')
+        sub.prop(self, 'row_spacing')
+        sub.prop(self, 'column_spacing')
+        col.separator()
+        col.prop(self, 'snap_step')
+        col.prop(self, 'overlaps')
+        col.separator()
+        col.prop(self, 'modal_threshold')
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene is not None and context.mode == "OBJECT"
+
+    def invoke(self, context, event):
+        placements = self.checked_placements()
+        if placements is None:
+            return {'CANCELLED'}
+
+        # Instance carrier is cheap to build, only real geometry needs steps
+        if len(placements) > self.modal_threshold and self.output != 'INSTANCED':
+            return self.start_modal(context, placements)
+        return self.add_windows(context, placements)
+
+    def window_placements(self):
+        if self.placements_file:
+            return load_window_placements(bpy.path.abspath(self.placements_file))
+
+        return grid_window_placements(self.rows, self.columns,
+                                      self.pp_Width + self.column_spacing,
+                                      self.pp_Height + self.row_spacing)
+
+    # Placements, or None after reporting why there are none
+    def checked_placements(self):
+        try:
+            placements = self.window_placements()
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            self.report({'ERROR'}, "Cannot read window placements: %s" % error)
+            return None
+
+        if not placements:
+            self.report({'WARNING'}, "No window placements")
+            return None
+
+        if self.snap_step > 0:
+            for placement, location in zip(placements, snapped_locations(placements, self.snap_step)):
+                placement.translation = location
+
+        if self.overlaps != 'IGNORE':
+            pairs = find_overlaps(placements, self.pp_Width, self.pp_Depth, self.pp_Height)
+            if pairs and self.overlaps == 'CANCEL':
+                self.report({'ERROR'}, "%d pairs of windows overlap (first: %d and %d)" % (len(pairs), *pairs[0]))
+                return None
+            if pairs and self.overlaps == 'SKIP':
+                keep = non_overlapping(len(placements), pairs)
+                self.report({'WARNING'}, "%d overlapping windows skipped" % (len(placements) - len(keep)))
+                placements = [placements[i] for i in keep]
+            elif pairs:
+                self.report({'WARNING'}, "%d pairs of windows overlap (first: %d and %d)" % (len(pairs), *pairs[0]))
+        return placements
+
+    def execute(self, context):
+        placements = self.checked_placements()
+        if placements is None:
+            return {'CANCELLED'}
+        return self.add_windows(context, placements)
+
+    def add_windows(self, context, placements):
+        window = self.generate_window_model()
+
+        if self.output == 'MERGED':
+            self.add_merged(context, self.merged_window_arrays(placements, window), len(placements))
+        elif self.output == 'INSTANCED':
+            self.add_instanced(context, self.linked_mesh(window), placements)
+        else:
+            mesh = self.linked_mesh(window)
+            base = self.begin_linked(context)
+            objs = self.add_linked(context, mesh, base, placements)
+            context.view_layer.objects.active = objs[-1]
+
+        return {'FINISHED'}
+
+    def add_merged(self, context, arrays, count):
+        mesh = bpy.data.meshes.new(name='House Window Array')
+        mesh_from_arrays(mesh, *arrays)
+        obj = object_utils.object_data_add(context, mesh, operator=self)
+
+        obj.data["houseWindowArray"] = True
+        obj.data["windowCount"] = count
+        for prm in hw_plugin_parameters():
+            obj.data[prm] = getattr(self, prm)
+        obj.data["lod"] = self.lod
+        plugin_meshes.add(obj.data)
+        return obj
+
+    # Carrier object instancing the window mesh on its faces (one face per placement),
+    # the window object itself is parented to the carrier as instancing prototype
+    def add_instanced(self, context, mesh, placements):
+        # Face instancing can only scale uniformly, see instance_carrier_arrays
+        distorted = sum(1 for placement in placements if non_uniform_scale(placement))
+        if distorted:
+            self.report({'WARNING'}, "%d windows have non-uniform scale, instances are scaled uniformly "
+                                     "(use Merged Mesh or Linked Duplicates to keep it)" % distorted)
+
+        carrier_mesh = bpy.data.meshes.new(name='House Window Instances')
+        mesh_from_arrays(carrier_mesh, *instance_carrier_arrays(placements))
+        carrier = object_utils.object_data_add(context, carrier_mesh, operator=self)
+
+        carrier.instance_type = 'FACES'
+        carrier.use_instance_faces_scale = True
+        carrier.instance_faces_scale = 1.0
+        carrier.display_type = 'WIRE'
+
+        carrier.data["houseWindowInstances"] = True
+        carrier.data["windowCount"] = len(placements)
+        plugin_meshes.add(carrier.data)
+
+        prototype = bpy.data.objects.new(mesh.name, mesh)
+        context.collection.objects.link(prototype)
+        prototype.parent = carrier
+        return carrier
+
+    # Mesh shared by all linked duplicates
+    def linked_mesh(self, window):
+        mesh = self.shared_window_mesh()
+        if mesh is None:
+            mesh = bpy.data.meshes.new(name='House Window')
+            mesh_from_arrays(mesh, *window)
+
+        hw_store_parameters(mesh, [getattr(self, prm) for prm in hw_plugin_parameters()], self.lod)
+        plugin_meshes.add(mesh)
+        return mesh
+
+    # Deselect everything and return matrix all duplicates are placed relative to
+    def begin_linked(self, context):
+        for obj in context.selected_objects:
+            obj.select_set(False)
+        return object_utils.add_object_align_init(context, self)
+
+    def add_linked(self, context, mesh, base, placements):
+        collection = context.collection
+        objs = []
+        for placement in placements:
+            obj = bpy.data.objects.new(mesh.name, mesh)
+            obj.matrix_world = base @ placement
+            collection.objects.link(obj)
+            obj.select_set(True)
+            objs.append(obj)
+        return objs
+
+    # Modal mode: windows are added in chunks from timer events, each step works
+    # at most time_budget seconds so the UI keeps redrawing. Esc removes
+    # everything added so far, finishing pushes a single undo step
+    def start_modal(self, context, placements):
+        self._placements = placements
+        self._done = 0
+        self._window = self.generate_window_model()
+        self._chunks = []
+        self._objects = []
+        # Restored by cancel, linked duplicates replace the selection
+        self._selection = list(context.selected_objects)
+        self._active = context.view_layer.objects.active
+
+        if self.output == 'LINKED':
+            self._mesh = self.linked_mesh(self._window)
+            self._base = self.begin_linked(context)
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.001, window=context.window)
+        wm.progress_begin(0, len(placements))
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS':
+            self.cancel(context)
+            self.report({'INFO'}, "House window array cancelled")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'RUNNING_MODAL'}
+
+        placements = self._placements
+        deadline = time.perf_counter() + self.time_budget
+        while self._done < len(placements) and time.perf_counter() < deadline:
+            chunk = placements[self._done:self._done + self.chunk_size]
+            if self.output == 'MERGED':
+                self._chunks.append(tile_mesh_arrays(*self._window, chunk, first=self._done))
+            else:
+                self._objects.extend(self.add_linked(context, self._mesh, self._base, chunk))
+            self._done += len(chunk)
+
+        context.window_manager.progress_update(self._done)
+        context.workspace.status_text_set("House window array: %d / %d windows (Esc to cancel)"
+                                          % (self._done, len(placements)))
+
+        if self._done < len(placements):
+            return {'RUNNING_MODAL'}
+
+        if self.output == 'MERGED':
+            self.add_merged(context, join_mesh_arrays(self._chunks), len(placements))
+        else:
+            context.view_layer.objects.active = self._objects[-1]
+
+        self.end_modal(context)
+        return {'FINISHED'}
+
+    def cancel(self, context):
+        for obj in self._objects:
+            bpy.data.objects.remove(obj)
+        self._objects = []
+        self._chunks = []
+        plugin_meshes.evict()
+
+        for obj in self._selection:
+            obj.select_set(True)
+        context.view_layer.objects.active = self._active
+
+        self.end_modal(context)
+
+    def end_modal(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+
+# Wall with window openings already cut out, instead of one Boolean modifier per
+# window. Openings are exactly window sized, windows are added as one merged
+# object parented to the wall
+class AddHouseWindowWall(Operator, AddObjectHelper, HouseWindowParameters):
+    bl_idname = "mesh.house_window_wall"
+    bl_label = "Add House Window Wall"
+    bl_description = "Add wall with openings for a grid of house windows"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    wall_width: FloatProperty(name='Wall Width',
+                              default=6.0,
+                              min=0.01,
+                              subtype='DISTANCE',
+                              description='Width of the wall')
+
+    wall_height: FloatProperty(name='Wall Height',
+                               default=3.0,
+                               min=0.01,
+                               subtype='DISTANCE',
+                               description='Height of the wall')
+
+    wall_thickness: FloatProperty(name='Wall Thickness',
+                                  default=0.3,
+                                  min=0.001,
+                                  subtype='DISTANCE',
+                                  description='Thickness of the wall')
+
+    sill_height: FloatProperty(name='Sill Height',
+                               default=0.9,
+                               min=0.0,
+                               subtype='DISTANCE',
+                               description='Height of the lowest window row above the wall bottom')
+
+    rows: IntProperty(name='Rows',
+                      default=1,
+                      min=0,
+                      description='Number of window rows')
+
+    columns: IntProperty(name='Columns',
+                         default=3,
+                         min=0,
+                         description='Number of window columns')
+
+    row_spacing: FloatProperty(name='Row Spacing',
+                               default=0.5,
+                               min=0.0,
+                               description='Gap between window rows')
+
+    column_spacing: FloatProperty(name='Column Spacing',
+                                  default=0.5,
+                                  min=0.0,
+                                  description='Gap between window columns')
+
+    add_windows: BoolProperty(name='Add Windows',
+                              default=True,
+                              description='Fill the openings with windows')
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+
+        col.prop(self, 'wall_width')
+        col.prop(self, 'wall_height')
+        col.prop(self, 'wall_thickness')
+        col.separator()
+        col.prop(self, 'rows')
+        col.prop(self, 'columns')
+        col.prop(self, 'row_spacing')
+        col.prop(self, 'column_spacing')
+        col.prop(self, 'sill_height')
+        col.separator()
+        col.prop(self, 'add_windows')
+        sub = col.column()
+        sub.enabled = self.add_windows
+        self.draw_window_parameters(sub)
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene is not None and context.mode == "OBJECT"
+
+    def execute(self, context):
+        self.clamp_frame_width()
+        openings = grid_openings(self.wall_width, self.rows, self.columns, self.pp_Width, self.pp_Height,
+                                 self.column_spacing, self.row_spacing, self.sill_height)
+        try:
+            wall = cached_arrays("wall", (self.wall_width, self.wall_height, self.wall_thickness, tuple(openings)),
+                                 lambda: wall_arrays(self.wall_width, self.wall_height, self.wall_thickness, openings))
+        except ValueError as error:
+            self.report({'ERROR'}, "Cannot cut window openings: %s" % error)
+            return {'CANCELLED'}
+
+        params = [getattr(self, prm) for prm in hw_plugin_parameters()]
+
+        mesh = bpy.data.meshes.new(name='House Window Wall')
+        mesh_from_arrays(mesh, *wall)
+        wall_obj = object_utils.object_data_add(context, mesh, operator=self)
+        wall_obj.data["houseWindowWall"] = True
+        wall_obj.data["windowCount"] = len(openings)
+        for prm, value in zip(hw_plugin_parameters(), params):
+            wall_obj.data[prm] = value
+        wall_obj.data["lod"] = self.lod
+        plugin_meshes.add(wall_obj.data)
+
+        if self.add_windows and openings:
+            placements = [Matrix.Translation((x, 0, z)) for x, z, w, h in openings]
+            mesh = bpy.data.meshes.new(name='House Window Array')
+            mesh_from_arrays(mesh, *self.merged_window_arrays(placements))
+            mesh["houseWindowArray"] = True
+            mesh["windowCount"] = len(openings)
+            for prm, value in zip(hw_plugin_parameters(), params):
+                mesh[prm] = value
+            mesh["lod"] = self.lod
+            plugin_meshes.add(mesh)
+
+            windows = bpy.data.objects.new(mesh.name, mesh)
+            context.collection.objects.link(windows)
+            windows.parent = wall_obj
+
+        return {'FINISHED'}
+
+
+# Changes every selected house window in one operator run (single undo step).
+# Objects ending up with the same parameters are grouped, so every distinct
+# window geometry is generated only once
+class ChangeHouseWindows(Operator):
+    bl_idname = "object.house_window_change"
+    bl_label = "Change Selected House Windows"
+    bl_description = "Change parameters of all selected house windows"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    mode: EnumProperty(name='Mode',
+                       items=(('ABSOLUTE', "Set", "Set parameters to given values"),
+                              ('RELATIVE', "Offset", "Add given values to current parameters")),
+                       default='ABSOLUTE',
+                       description='How values are applied')
+
+    use_width: BoolProperty(name='Change Width', default=False)
+    width: FloatProperty(name='Width', default=1.0, description='Width of window (or offset)')
+
+    use_height: BoolProperty(name='Change Height', default=False)
+    height: FloatProperty(name='Height', default=1.0, description='Height of window (or offset)')
+
+    use_depth: BoolProperty(name='Change Depth', default=False)
+    depth: FloatProperty(name='Depth', default=0.1, description='Depth of window (or offset)')
+
+    use_frame_width: BoolProperty(name='Change Frame Width', default=False)
+    frame_width: FloatProperty(name='Frame Width', default=0.1, description='Frame width (or offset)')
+
+    share_mesh: BoolProperty(name='Share Mesh',
+                             default=True,
+                             description='Windows with identical parameters use one mesh')
+
+    # Matches hw_plugin_parameters() order, with the lower limit of every parameter
+    fields = (("use_width", "width", 0.001),
+              ("use_height", "height", 0.001),
+              ("use_depth", "depth", 0.001),
+              ("use_frame_width", "frame_width", 0.0001))
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+
+        col.prop(self, 'mode')
+        col.separator()
+        for use, value, _minimum in self.fields:
+            row = col.row()
+            row.prop(self, use, text="")
+            sub = row.row()
+            sub.enabled = getattr(self, use)
+            sub.prop(self, value)
+        col.separator()
+        col.prop(self, 'share_mesh')
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == "OBJECT" and len(context.selected_objects) > 0
+
+    def invoke(self, context, event):
+        # Start from the active window, so "Set" changes nothing until edited
+        obj = context.active_object
+        if self.mode == 'ABSOLUTE' and obj is not None and obj.data is not None \
+                and 'houseWindow' in obj.data.keys():
+            for (_use, value, _minimum), prm in zip(self.fields, hw_plugin_parameters()):
+                setattr(self, value, obj.data[prm])
+        return self.execute(context)
+
+    def new_parameters(self, mesh):
+        params = []
+        for (use, value, minimum), prm in zip(self.fields, hw_plugin_parameters()):
+            current = mesh[prm]
+            if getattr(self, use):
+                current = getattr(self, value) + (current if self.mode == 'RELATIVE' else 0.0)
+            params.append(max(current, minimum))
+        params[3] = clamp_frame_width(params[0], params[1], params[3])
+        return params
+
+    def execute(self, context):
+        windows = [obj for obj in context.selected_objects
+                   if obj.type == 'MESH' and 'houseWindow' in obj.data.keys()]
+        if not windows:
+            self.report({'WARNING'}, "No house windows selected")
+            return {'CANCELLED'}
+
+        # Windows with automatic detail are changed through their source mesh
+        for obj in windows:
+            lod_restore_source(obj)
+
+        # Group objects by resulting parameters and materials, every window keeps
+        # its level of detail and look
+        groups = {}
+        for obj in windows:
+            params = self.new_parameters(obj.data)
+            lod = obj.data.get("lod", "simple")
+            materials = tuple(obj.data.materials)
+            group = groups.setdefault((hw_parameter_key(params, lod), materials), (params, lod, []))
+            group[2].append(obj)
+
+        generated = 0
+        for (key, materials), (params, lod, objs) in groups.items():
+            mesh = plugin_meshes.get(key, materials) if self.share_mesh else None
+            if mesh is not None:
+                for obj in objs:
+                    obj.data = mesh
+                clear_vertex_groups(objs)
+                continue
+
+            window = window_arrays(*params, variant=lod)
+            generated += 1
+
+            users = {}
+            for obj in objs:
+                users.setdefault(obj.data, []).append(obj)
+
+            for mesh, mesh_objs in users.items():
+                # Mesh is also used by windows outside of this group, they keep their size
+                if mesh.users > len(mesh_objs):
+                    mesh = mesh.copy()
+                    for obj in mesh_objs:
+                        obj.data = mesh
+
+                shading = mesh_shading(mesh)
+                update_mesh_arrays(mesh, *window)
+                restore_shading(mesh, shading)
+
+                hw_store_parameters(mesh, params, lod)
+                plugin_meshes.add(mesh)
+
+                if self.share_mesh:
+                    for obj in objs:
+                        obj.data = mesh
+                    break
+
+            clear_vertex_groups(objs)
+
+        for obj in windows:
+            if "houseWindowLOD" in obj.keys():
+                lod_update_source(obj, context.scene)
+
+        plugin_meshes.evict()
+        self.report({'INFO'}, "%d windows changed, %d meshes generated" % (len(windows), generated))
+        return {'FINISHED'}
+
+
+# Automatic level of detail. Window objects carrying "houseWindowLOD" switch
+# their mesh between variants of the same parameters: "lodViewport" is shown in
+# the viewport (or picked by camera distance), "lodRender" replaces it while
+# rendering. Variant meshes are shared through plugin_meshes like any other window.
+# Rendering from the UI should use Render > Lock Interface, as meshes are
+# swapped from render handlers.
+
+# Mesh with the same parameters as mesh, in given level of detail
+def window_lod_mesh(mesh, lod):
+    params = [mesh[prm] for prm in hw_plugin_parameters()]
+    key = hw_parameter_key(params, lod)
+    if hw_mesh_key(mesh) == key:
+        return mesh
+
+    lod_mesh = plugin_meshes.get(key, mesh.materials)
+    if lod_mesh is not None:
+        return lod_mesh
+
+    lod_mesh = bpy.data.meshes.new(name='House Window')
+    mesh_from_arrays(lod_mesh, *window_arrays(*params, variant=lod))
+    for material in mesh.materials:
+        lod_mesh.materials.append(material)
+    hw_store_parameters(lod_mesh, params, lod)
+    plugin_meshes.add(lod_mesh)
+    return lod_mesh
+
+
+# Mesh the object had before automatic detail was enabled. Every variant is
+# derived from it, and the pointer is a user of it, so neither evict() nor
+# saving the file drops it while a variant is shown
+def lod_source(obj):
+    return obj.house_window_lod_source or obj.data
+
+
+# Show the source mesh again, so an operator changes it rather than the variant
+def lod_restore_source(obj):
+    if "houseWindowLOD" in obj.keys() and obj.house_window_lod_source is not None:
+        obj.data = obj.house_window_lod_source
+        obj.house_window_lod_source = None
+
+
+# The changed mesh becomes the source, the viewport variant is derived from it again
+def lod_update_source(obj, scene):
+    obj.house_window_lod_source = obj.data
+    apply_viewport_lod([obj], scene)
+
+
+def lod_windows(scene):
+    return [obj for obj in scene.objects if obj.type == 'MESH' and "houseWindowLOD" in obj.keys()]
+
+
+def distance_lod(obj, origin):
+    distance = (obj.matrix_world.translation - origin).length
+    if distance < obj["lodNear"]:
+        return 'detailed'
+    if distance < obj["lodFar"]:
+        return 'simple'
+    return 'proxy'
+
+
+def apply_viewport_lod(objects, scene):
+    camera = scene.camera
+    for obj in objects:
+        # Render in progress, mesh is restored by hw_render_post
+        if "lodViewportMesh" in obj.keys():
+            continue
+
+        lod = obj["lodViewport"]
+        if lod == 'DISTANCE':
+            if camera is None:
+                continue
+            lod = distance_lod(obj, camera.matrix_world.translation)
+
+        # Compared by key, the source may have been regenerated since
+        source = lod_source(obj)
+        if hw_mesh_key(obj.data) != hw_parameter_key([source[prm] for prm in hw_plugin_parameters()], lod):
+            obj.data = window_lod_mesh(source, lod)
+
+
+@persistent
+def hw_render_pre(scene, *args):
+    for obj in lod_windows(scene):
+        obj["lodViewportMesh"] = obj.data.name
+        obj.data = window_lod_mesh(lod_source(obj), obj["lodRender"])
+
+
+@persistent
+def hw_render_post(scene, *args):
+    for obj in lod_windows(scene):
+        if "lodViewportMesh" not in obj.keys():
+            continue
+        mesh = bpy.data.meshes.get(obj["lodViewportMesh"])
+        if mesh is not None:
+            obj.data = mesh
+        del obj["lodViewportMesh"]
+
+
+# Camera moves with animation, distance based LOD follows it. Animated window
+# parameters are regenerated here too (see regenerate_animated_windows)
+@persistent
+def hw_frame_change_post(scene, *args):
+    prefs = addon_preferences(bpy.context)
+    if prefs is None or prefs.live_update:
+        regenerate_animated_windows()
+
+    apply_viewport_lod([obj for obj in lod_windows(scene) if obj["lodViewport"] == 'DISTANCE'], scene)
+
+
+class SetHouseWindowLOD(Operator):
+    bl_idname = "object.house_window_lod"
+    bl_label = "House Window Level of Detail"
+    bl_description = "Set viewport and render level of detail of selected house windows"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    enable: BoolProperty(name='Automatic Detail',
+                         default=True,
+                         description='Switch detail between viewport and render '
+                                     '(off restores the original mesh)')
+
+    viewport: EnumProperty(name='Viewport',
+                           items=LOD_ITEMS + (('DISTANCE', "By Camera Distance",
+                                               "Detailed near the scene camera, proxy far from it"),),
+                           default='proxy',
+                           description='Level of detail shown in the viewport')
+
+    render: EnumProperty(name='Render',
+                         items=LOD_ITEMS,
+                         default='detailed',
+                         description='Level of detail used for rendering')
+
+    near_distance: FloatProperty(name='Near',
+                                 default=10.0,
+                                 min=0.0,
+                                 subtype='DISTANCE',
+                                 description='Closer to the camera than this windows are detailed')
+
+    far_distance: FloatProperty(name='Far',
+                                default=50.0,
+                                min=0.0,
+                                subtype='DISTANCE',
+                                description='Farther from the camera than this windows are proxies')
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+
+        col.prop(self, 'enable')
+        sub = col.column()
+        sub.enabled = self.enable
+        sub.prop(self, 'viewport')
+        sub.prop(self, 'render')
+        dist = sub.column()
+        dist.enabled = self.viewport == 'DISTANCE'
+        dist.prop(self, 'near_distance')
+        dist.prop(self, 'far_distance')
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == "OBJECT" and len(context.selected_objects) > 0
+
+    def execute(self, context):
+        windows = [obj for obj in context.selected_objects
+                   if obj.type == 'MESH' and 'houseWindow' in obj.data.keys()]
+
+        for obj in windows:
+            if self.enable:
+                if obj.house_window_lod_source is None:
+                    obj.house_window_lod_source = obj.data
+                obj["houseWindowLOD"] = True
+                obj["lodViewport"] = self.viewport
+                obj["lodRender"] = self.render
+                obj["lodNear"] = self.near_distance
+                obj["lodFar"] = self.far_distance
+            else:
+                for key in ("houseWindowLOD", "lodViewport", "lodRender", "lodNear", "lodFar"):
+                    if key in obj.keys():
+                        del obj[key]
+                obj.data = lod_source(obj)
+                obj.house_window_lod_source = None
+
+        if self.enable:
+            apply_viewport_lod(windows, context.scene)
+
+        return {'FINISHED'}
+
+
+# Live regeneration. Editing, animating or driving the stored pp_* properties of
+# a window mesh tags it in the depsgraph. The handler only collects such meshes,
+# a timer then regenerates each of them once, however many updates came in between.
+LIVE_UPDATE_DELAY = 0.05
+
+_pending_meshes = set()
+
+
+# Meshes from files saved before live regeneration have no "generated" and are
+# left alone, so hand edits of their geometry are not overwritten
+def hw_mesh_outdated(mesh):
+    if "generated" not in mesh.keys() or mesh.is_editmode:
+        return False
+    key = hw_mesh_key(mesh)
+    return key is not None and mesh["generated"] != repr(key)
+
+
+def regenerate_window_mesh(mesh):
+    params = [mesh[prm] for prm in hw_plugin_parameters()]
+    lod = mesh.get("lod", "simple")
+
+    shading = mesh_shading(mesh)
+    if update_mesh_arrays(mesh, *window_arrays(*params, variant=lod)):
+        clear_vertex_groups([obj for obj in bpy.data.objects if obj.data == mesh])
+    restore_shading(mesh, shading)
+
+    hw_mark_generated(mesh, params, lod)
+    plugin_meshes.add(mesh)
+
+    # Windows with automatic detail show variants of their source mesh. A
+    # regenerated variant takes the source along to its new parameters, a
+    # regenerated source gets its variants derived again
+    for obj in bpy.data.objects:
+        if obj.type != 'MESH' or "houseWindowLOD" not in obj.keys() or obj.house_window_lod_source is None:
+            continue
+        source = obj.house_window_lod_source
+        if obj.data == mesh and source != mesh:
+            obj.house_window_lod_source = window_lod_mesh(mesh, source.get("lod", "simple"))
+        elif source != mesh:
+            continue
+        apply_viewport_lod([obj], bpy.context.scene)
+
+
+def hw_regenerate_pending():
+    names = list(_pending_meshes)
+    _pending_meshes.clear()
+
+    for name in names:
+        mesh = bpy.data.meshes.get(name)
+        if mesh is not None and hw_mesh_outdated(mesh):
+            regenerate_window_mesh(mesh)
+
+    # One shot timer, registered again by the next update
+    return None
+
+
+# Keyframes and drivers change pp_* properties on frame change without an update
+# reaching depsgraph_update_post. Windows with animation data are checked on every
+# frame and regenerated right away, so playback, scrubbing and rendered animations
+# show the parameters of the current frame
+def regenerate_animated_windows():
+    for mesh in plugin_meshes.meshes("houseWindow"):
+        if mesh.animation_data is not None and hw_mesh_outdated(mesh):
+            regenerate_window_mesh(mesh)
+
+
+# Blender 2.80 passes the scene only, later versions also the depsgraph
+@persistent
+def hw_depsgraph_update_post(scene, *args):
+    prefs = addon_preferences(bpy.context)
+    live_update = prefs is None or prefs.live_update
+
+    depsgraph = args[0] if args else bpy.context.evaluated_depsgraph_get()
+    for update in depsgraph.updates:
+        mesh = update.id.original
+        if not isinstance(mesh, bpy.types.Mesh):
+            continue
+
+        # Plugin meshes created outside of operators, e.g. by duplicating objects
+        if plugin_meshes.scanned and mesh not in plugin_meshes and hw_mesh_entry(mesh) is not None:
+            plugin_meshes.add(mesh)
+
+        if live_update and hw_mesh_outdated(mesh):
+            _pending_meshes.add(mesh.name)
+
+    if _pending_meshes and not bpy.app.timers.is_registered(hw_regenerate_pending):
+        bpy.app.timers.register(hw_regenerate_pending, first_interval=LIVE_UPDATE_DELAY)
+
+
+# Register section:
+def house_window_context_menu(self, context):
+    bl_label = 'Edit House Window Object'
+
+    obj = context.object
+    layout = self.layout
+
+    if obj.data is not None and 'houseWindow' in obj.data.keys():
+        props = layout.operator("mesh.house_window", text="Change House Window Parameters")
+        props.change = True
+        if len(context.selected_objects) > 1:
+            layout.operator(ChangeHouseWindows.bl_idname, text="Change Selected House Windows")
+        layout.operator(SetHouseWindowLOD.bl_idname, text="House Window Level of Detail")
+        layout.separator()
+
+
+def house_window_main_func(self, context):
+    layout = self.layout
+    layout.separator()
+    op = self.layout.operator(AddHouseWindowMesh.bl_idname, text="Add House Window Object", icon="MOD_LATTICE")
+    op.change = False
+    self.layout.operator(AddHouseWindowArray.bl_idname, text="Add House Window Array", icon="MOD_ARRAY")
+    self.layout.operator(AddHouseWindowWall.bl_idname, text="Add House Window Wall", icon="MOD_BUILD")
+
+
+classes = (
+    HouseWindowPreferences,
+    AddHouseWindowMesh,
+    AddHouseWindowArray,
+    AddHouseWindowWall,
+    ChangeHouseWindows,
+    SetHouseWindowLOD,
+)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+    bpy.types.Object.house_window_lod_source = PointerProperty(
+        type=bpy.types.Mesh,
+        name='House Window LOD Source',
+        description='Original mesh of a window with automatic level of detail')
+
+    bpy.types.VIEW3D_MT_mesh_add.append(house_window_main_func)
+    bpy.types.VIEW3D_MT_object_context_menu.prepend(house_window_context_menu)
+    bpy.app.handlers.load_post.append(hw_load_post)
+    bpy.app.handlers.undo_post.append(hw_load_post)
+    bpy.app.handlers.redo_post.append(hw_load_post)
+    bpy.app.handlers.render_pre.append(hw_render_pre)
+    bpy.app.handlers.render_post.append(hw_render_post)
+    bpy.app.handlers.render_cancel.append(hw_render_post)
+    bpy.app.handlers.frame_change_post.append(hw_frame_change_post)
+    bpy.app.handlers.depsgraph_update_post.append(hw_depsgraph_update_post)
+
+
+def unregister():
+    if bpy.app.timers.is_registered(hw_regenerate_pending):
+        bpy.app.timers.unregister(hw_regenerate_pending)
+    bpy.app.handlers.depsgraph_update_post.remove(hw_depsgraph_update_post)
+    bpy.app.handlers.frame_change_post.remove(hw_frame_change_post)
+    bpy.app.handlers.render_cancel.remove(hw_render_post)
+    bpy.app.handlers.render_post.remove(hw_render_post)
+    bpy.app.handlers.render_pre.remove(hw_render_pre)
+    bpy.app.handlers.redo_post.remove(hw_load_post)
+    bpy.app.handlers.undo_post.remove(hw_load_post)
+    bpy.app.handlers.load_post.remove(hw_load_post)
+    plugin_meshes.clear()
+
+    bpy.types.VIEW3D_MT_object_context_menu.remove(house_window_context_menu)
+    bpy.types.VIEW3D_MT_mesh_add.remove(house_window_main_func)
+    del bpy.types.Object.house_window_lod_source
+
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+
@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Opt-in timing of operator runs. A recorded run holds wall time per phase and
+# the number of generated vertices and faces. The latest runs stay in memory:
+#
+#   from add_mesh_house_window import profiling
+#   profiling.enable()
+#   bpy.ops.mesh.house_window()
+#   print(profiling.records()[-1])
+#
+# Recording is also switched on by the "Record Timings" add-on preference.
+# Like geometry, this module must not import bpy. The timers and profiled() are
+# copied into blender_add_mesh_plugin.py, keep both in step.
+
+import cProfile
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+enabled = False
+
+_records = deque(maxlen=256)
+
+
+def enable(state=True):
+    global enabled
+    enabled = state
+
+
+def records():
+    return list(_records)
+
+
+def clear():
+    _records.clear()
+
+
+class RunTimer:
+
+    def __init__(self, name):
+        self.record = {
+            "operator": name,
+            "phases": {},
+            "vertices": 0,
+            "faces": 0,
+            "total": 0.0,
+        }
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phases = self.record["phases"]
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+    # Count geometry of flat arrays (coords, vertex_indices, loop_starts, loop_totals)
+    def count(self, arrays):
+        self.record["vertices"] += len(arrays[0]) // 3
+        self.record["faces"] += len(arrays[3])
+
+    def finish(self):
+        self.record["total"] = time.perf_counter() - self._start
+        _records.append(self.record)
+
+
+# Used while recording is off, so operators do not need to check
+class NullTimer:
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def count(self, arrays):
+        pass
+
+    def finish(self):
+        pass
+
+
+_null_timer = NullTimer()
+
+
+def start(name, force=False):
+    return RunTimer(name) if enabled or force else _null_timer
+
+
+# Run the block under cProfile and dump stats to <directory>/<name>_<milliseconds>.prof.
+# The block has already changed data when stats are dumped, so a directory that
+# cannot be written is only reported and never fails the operator
+@contextmanager
+def profiled(name, directory):
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        filepath = os.path.join(directory, "%s_%d.prof" % (name.replace(".", "_"), int(time.time() * 1000)))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            profile.dump_stats(filepath)
+        except OSError as error:
+            print("Cannot write profile %s: %s" % (filepath, error))
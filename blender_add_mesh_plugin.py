@@ -12,11 +12,20 @@ bl_info = {
     "category": "Add Mesh",
 }
 
+import cProfile
+import os
+import tempfile
+import time
+from array import array
+from collections import deque
+from contextlib import contextmanager
+
 import bpy
 import bmesh
-from bpy.types import Operator
+from bpy.types import AddonPreferences, Operator
 from bpy.props import (
     FloatProperty,
+    StringProperty,
     PointerProperty,
     BoolProperty,
 )
@@ -24,6 +33,259 @@ from bpy_extras import object_utils
 from mathutils import Vector
 from bpy_extras.object_utils import AddObjectHelper
 
+
+# Helpers below are copied from the house window add-on, so the template stays one
+# file. Keep signatures identical to the originals and apply fixes to both copies.
+
+# Mirrors MeshBuilder in add_mesh_house_window/geometry.py
+
+# Collects faces while welding vertices closer than tolerance. Vertices are found
+# through a hash of their quantized coordinates and faces through their sorted
+# vertex indices, so every added face costs O(corners) instead of a full scan.
+class MeshBuilder:
+
+    def __init__(self, tolerance=1e-6):
+        self.tolerance = tolerance
+        self._scale = 1.0 / tolerance if tolerance > 0 else None
+
+        # Flat buffers: xyz per vertex, vertex indices per loop, corners per face
+        self.coords = array('f')
+        self.vertex_indices = array('i')
+        self.loop_totals = array('i')
+
+        self._vertex_lookup = {}
+        self._face_keys = set()
+
+    @property
+    def vertex_count(self):
+        return len(self.coords) // 3
+
+    @property
+    def face_count(self):
+        return len(self.loop_totals)
+
+    def vertex_key(self, co):
+        x, y, z = co
+        if self._scale is None:
+            return x, y, z
+        return round(x * self._scale), round(y * self._scale), round(z * self._scale)
+
+    # Return index of vertex at co, adding it if no vertex is there yet
+    def add_vertex(self, co):
+        key = self.vertex_key(co)
+        index = self._vertex_lookup.get(key)
+        if index is None:
+            index = len(self.coords) // 3
+            self._vertex_lookup[key] = index
+            self.coords.extend(co)
+        return index
+
+    # Add face without duplicates
+    def add_face(self, vectors):
+        v_index = [self.add_vertex(v) for v in vectors]
+
+        face_key = tuple(sorted(v_index))
+        if face_key in self._face_keys:
+            return "DUPLICATE"
+        self._face_keys.add(face_key)
+
+        self.vertex_indices.extend(v_index)
+        self.loop_totals.append(len(v_index))
+        return "SUCCESS"
+
+    def loop_starts(self):
+        starts = array('i', bytes(4 * len(self.loop_totals)))
+        total = 0
+        for i, count in enumerate(self.loop_totals):
+            starts[i] = total
+            total += count
+        return starts
+
+    # Flat arrays: coords (float32), vertex_indices, loop_starts, loop_totals (int32)
+    def to_arrays(self):
+        return self.coords, self.vertex_indices, self.loop_starts(), self.loop_totals
+
+
+# Mirrors add_mesh_house_window/operators.py, mesh_from_arrays to clear_vertex_groups
+
+# Fill an empty mesh from flat buffers (array.array or NumPy, float32 coords and
+# int32 indices) with bulk foreach_set calls instead of from_pydata
+def mesh_from_arrays(mesh, coords, vertex_indices, loop_starts, loop_totals):
+    mesh.vertices.add(len(coords) // 3)
+    mesh.loops.add(len(vertex_indices))
+    mesh.polygons.add(len(loop_totals))
+
+    mesh.vertices.foreach_set("co", coords)
+    mesh.loops.foreach_set("vertex_index", vertex_indices)
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    # Newer Blender versions derive loop_total from loop_start and make it read only
+    if not mesh.polygons.bl_rna.properties["loop_total"].is_readonly:
+        mesh.polygons.foreach_set("loop_total", loop_totals)
+
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+# Rewrite geometry of an existing mesh in place, leaving materials etc. untouched.
+# When topology is unchanged only vertex coordinates are written.
+# Returns True when topology had to be rebuilt
+def update_mesh_arrays(mesh, coords, vertex_indices, loop_starts, loop_totals):
+    if len(mesh.vertices) * 3 == len(coords) and len(mesh.polygons) == len(loop_totals) \
+            and len(mesh.loops) == len(vertex_indices):
+        mesh.vertices.foreach_set("co", coords)
+        mesh.update()
+        return False
+
+    if hasattr(mesh, "clear_geometry"):
+        mesh.clear_geometry()
+    else:
+        # Blender 2.80 has no clear_geometry, empty bmesh does the same
+        bm = bmesh.new()
+        bm.to_mesh(mesh)
+        bm.free()
+
+    mesh_from_arrays(mesh, coords, vertex_indices, loop_starts, loop_totals)
+    return True
+
+
+# Append flat buffers to an edit mode bmesh. Written straight into the bmesh,
+# so no temporary mesh datablock is created. Returns the new faces
+def bmesh_add_arrays(bm, coords, vertex_indices, loop_starts, loop_totals):
+    new_vert = bm.verts.new
+    new_face = bm.faces.new
+    verts = [new_vert(coords[i:i + 3]) for i in range(0, len(coords), 3)]
+    return [new_face([verts[i] for i in vertex_indices[start:start + total]])
+            for start, total in zip(loop_starts, loop_totals)]
+
+
+# Shading choices of a mesh that survive regeneration
+def mesh_shading(mesh):
+    use_smooth = len(mesh.polygons) > 0 and mesh.polygons[0].use_smooth
+    return bool(mesh.use_auto_smooth), bool(use_smooth)
+
+
+# Restore flat/smooth choice with one bulk write instead of bpy.ops.object.shade_smooth,
+# so neither selection nor active object matter
+def restore_shading(mesh, shading):
+    use_auto_smooth, use_smooth = shading
+    mesh.use_auto_smooth = use_auto_smooth
+    mesh.polygons.foreach_set("use_smooth", [use_smooth] * len(mesh.polygons))
+
+
+# Data API replacement for bpy.ops.object.vertex_group_remove(all=True)
+def clear_vertex_groups(objects):
+    for obj in objects:
+        obj.vertex_groups.clear()
+
+
+# Mirrors add_mesh_house_window/profiling.py, module state is prefixed with timing_
+
+# Opt-in timing of operator runs (wall time per phase, vertex/face counts).
+# Switched on by the "Record Timings" preference or by setting timing_enabled,
+# the latest runs are kept in timing_records
+timing_enabled = False
+timing_records = deque(maxlen=256)
+
+
+class RunTimer:
+
+    def __init__(self, name):
+        self.record = {
+            "operator": name,
+            "phases": {},
+            "vertices": 0,
+            "faces": 0,
+            "total": 0.0,
+        }
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phases = self.record["phases"]
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+    # Count geometry of flat arrays (coords, vertex_indices, loop_starts, loop_totals)
+    def count(self, arrays):
+        self.record["vertices"] += len(arrays[0]) // 3
+        self.record["faces"] += len(arrays[3])
+
+    def finish(self):
+        self.record["total"] = time.perf_counter() - self._start
+        timing_records.append(self.record)
+
+
+# Used while recording is off, so operators do not need to check
+class NullTimer:
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def count(self, arrays):
+        pass
+
+    def finish(self):
+        pass
+
+
+def start_timer(name, force=False):
+    return RunTimer(name) if timing_enabled or force else NullTimer()
+
+
+# Run the block under cProfile and dump stats to <directory>/<name>_<milliseconds>.prof.
+# The block has already changed data when stats are dumped, so a directory that
+# cannot be written is only reported and never fails the operator
+@contextmanager
+def profiled(name, directory):
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        filepath = os.path.join(directory, "%s_%d.prof" % (name.replace(".", "_"), int(time.time() * 1000)))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            profile.dump_stats(filepath)
+        except OSError as error:
+            print("Cannot write profile %s: %s" % (filepath, error))
+
+
+class BlenderMeshPluginPreferences(AddonPreferences):
+    bl_idname = __name__
+
+    record_timings: BoolProperty(name='Record Timings',
+                                 default=False,
+                                 description='Record wall time per phase of every operator run (timing_records)')
+
+    profile: BoolProperty(name='cProfile Dumps',
+                          default=False,
+                          description='Write a cProfile .prof file for every operator run')
+
+    profile_directory: StringProperty(name='Profile Directory',
+                                      subtype='DIR_PATH',
+                                      description='Where .prof files are written (temporary directory if empty)')
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+
+        col.prop(self, 'record_timings')
+        col.prop(self, 'profile')
+        sub = col.column()
+        sub.enabled = self.profile
+        sub.prop(self, 'profile_directory')
+
+
+def addon_preferences(context):
+    addon = context.preferences.addons.get(__name__)
+    return addon.preferences if addon is not None else None
+
+
 # Based on BoltFactory Plugin by Aaron Keith
 class BlenderMeshAdd(Operator, AddObjectHelper):
     bl_idname = "mesh.bl_mesh_add"
@@ -65,9 +327,29 @@ class BlenderMeshAdd(Operator, AddObjectHelper):
         return context.scene is not None
 
     def invoke(self, context, event):
+        # Parameters of the changed object are read here, not for every draw of the context menu
+        obj = context.active_object
+        if self.change and obj is not None and obj.data is not None and 'blenderMeshPlugin' in obj.data.keys():
+            for prm in plugin_parameters():
+                setattr(self, prm, obj.data[prm])
         return self.execute(context)
 
     def execute(self, context):
+        prefs = addon_preferences(context)
+        timer = start_timer(self.bl_idname, prefs is not None and prefs.record_timings)
+
+        if prefs is not None and prefs.profile:
+            directory = bpy.path.abspath(prefs.profile_directory) if prefs.profile_directory \
+                else tempfile.gettempdir()
+            with profiled(self.bl_idname, directory):
+                result = self.run(context, timer)
+        else:
+            result = self.run(context, timer)
+
+        timer.finish()
+        return result
+
+    def run(self, context, timer):
 
         if bpy.context.mode == "OBJECT":
             if context.selected_objects != [] and context.active_object and \
@@ -78,55 +360,48 @@ class BlenderMeshAdd(Operator, AddObjectHelper):
                 obj = context.active_object
 
                 # This will COPY and preserve smooth choices
-                use_auto_smooth = bool(obj.data.use_auto_smooth)
-                use_smooth = bool(obj.data.polygons[0].use_smooth)
+                shading = mesh_shading(obj.data)
 
                 # This is simply square with pp_Value1 property
-                verts = [Vector((self.pp_Value1, 0, 0)),
-                         Vector((1, 0, 0)),
-                         Vector((1, 1, 0)),
-                         Vector((0, 1, 0))
-                    ]
-                faces = [[0, 1, 2, 3]]
-                edges = []
-
-                mesh = bpy.data.meshes.new(name='Mesh from Blender Plugin')
-                mesh.from_pydata(verts, edges, faces)
+                with timer.phase("generate"):
+                    builder = MeshBuilder()
+                    builder.add_face([Vector((self.pp_Value1, 0, 0)),
+                                      Vector((1, 0, 0)),
+                                      Vector((1, 1, 0)),
+                                      Vector((0, 1, 0))])
+                    arrays = builder.to_arrays()
+                timer.count(arrays)
 
                 # Modify existing mesh data object by replacing geometry (but leaving materials etc)
-                bm = bmesh.new()
-                bm.from_mesh(mesh)
-                bm.to_mesh(obj.data)
-                bm.free()
+                with timer.phase("upload"):
+                    update_mesh_arrays(obj.data, *arrays)
 
                 # Preserve flat/smooth choice. New mesh is flat by default
-                obj.data.use_auto_smooth = use_auto_smooth
-                if use_smooth:
-                    bpy.ops.object.shade_smooth()
-
-                bpy.data.meshes.remove(mesh)
+                with timer.phase("shading"):
+                    restore_shading(obj.data, shading)
 
-                try:
-                    bpy.ops.object.vertex_group_remove(all=True)
-                except:
-                    pass
+                with timer.phase("vertex_groups"):
+                    clear_vertex_groups([obj])
 
             else:
                 # This is simply square with second pp_Value2 property
                 # Finally all mesh code should look the same (above and below)
-                verts = [Vector((0, self.pp_Value2, 0)),
-                         Vector((1, 0, 0)),
-                         Vector((1, 1, 0)),
-                         Vector((0, 1, 0))
-                         ]
-                faces = [[0, 1, 2, 3]]
-                edges = []
-
-                mesh = bpy.data.meshes.new(name='Mesh from Blender Plugin')
-                mesh.from_pydata(verts, edges, faces)
-                # mesh.validate(verbose=True)
-
-                obj = object_utils.object_data_add(context, mesh, operator=self)
+                with timer.phase("generate"):
+                    builder = MeshBuilder()
+                    builder.add_face([Vector((0, self.pp_Value2, 0)),
+                                      Vector((1, 0, 0)),
+                                      Vector((1, 1, 0)),
+                                      Vector((0, 1, 0))])
+                    arrays = builder.to_arrays()
+                timer.count(arrays)
+
+                with timer.phase("upload"):
+                    mesh = bpy.data.meshes.new(name='Mesh from Blender Plugin')
+                    mesh_from_arrays(mesh, *arrays)
+                    # mesh.validate(verbose=True)
+
+                with timer.phase("object_add"):
+                    obj = object_utils.object_data_add(context, mesh, operator=self)
 
             obj.data["blenderMeshPlugin"] = True
             obj.data["change"] = False
@@ -136,23 +411,23 @@ class BlenderMeshAdd(Operator, AddObjectHelper):
         if bpy.context.mode == "EDIT_MESH":
             obj = context.edit_object
 
-            # Changes in EDIT MODE produce a different result (intended)
-            verts = [Vector((0, 0, 0)),
-                     Vector((self.pp_Value2, 0, 0)),
-                     Vector((1, 1, 0)),
-                     Vector((0, 1, 0))
-                     ]
-            faces = [[0, 1, 2, 3]]
-            edges = []
-
-            mesh = bpy.data.meshes.new(name='Mesh from Blender Plugin')
-            mesh.from_pydata(verts, edges, faces)
+            # 3D cursor or the location/rotation from the redo panel, in object space
+            matrix = obj.matrix_world.inverted() @ object_utils.add_object_align_init(context, self)
 
-            bm = bmesh.from_edit_mesh(obj.data)  # Access edit mode's mesh data
-            bm.from_mesh(mesh)  # Append new mesh data
-            bmesh.update_edit_mesh(obj.data)  # Flush changes (update edit mode's view)
-
-            bpy.data.meshes.remove(mesh)  # Remove temporary mesh
+            # Changes in EDIT MODE produce a different result (intended)
+            with timer.phase("generate"):
+                builder = MeshBuilder()
+                builder.add_face([matrix @ Vector((0, 0, 0)),
+                                  matrix @ Vector((self.pp_Value2, 0, 0)),
+                                  matrix @ Vector((1, 1, 0)),
+                                  matrix @ Vector((0, 1, 0))])
+                arrays = builder.to_arrays()
+            timer.count(arrays)
+
+            with timer.phase("edit_mesh"):
+                bm = bmesh.from_edit_mesh(obj.data)  # Access edit mode's mesh data
+                bmesh_add_arrays(bm, *arrays)
+                bmesh.update_edit_mesh(obj.data)  # Flush changes (update edit mode's view)
 
         return {'FINISHED'}
 
@@ -167,8 +442,6 @@ def pl_contex_menu(self, context):
     if obj.data is not None and 'blenderMeshPlugin' in obj.data.keys():
         props = layout.operator("mesh.bl_mesh_add", text="Change Plugin Parameters")
         props.change = True
-        for prm in plugin_parameters():
-            setattr(props, prm, obj.data[prm])
         layout.separator()
 
 
@@ -180,6 +453,7 @@ def pl_main_func(self, context):
 
 
 classes = (
+    BlenderMeshPluginPreferences,
     BlenderMeshAdd,
 )
 
@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Overlap checks of window placements. The geometry module does not import bpy,
+# so these run with plain pytest from the repository root:
+#
+# python -m pytest -q tests
+
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from add_mesh_house_window.geometry import (  # noqa: E402
+    boxes_overlap,
+    find_overlaps,
+    non_overlapping,
+    placement_box,
+)
+
+WIDTH, DEPTH, HEIGHT = 1.0, 0.1, 1.0
+
+
+# Placement rotated about Z by angle, then moved to (x, y, z)
+def placement(x, y=0.0, z=0.0, angle=0.0):
+    c, s = math.cos(angle), math.sin(angle)
+    return [[c, -s, 0.0, x],
+            [s, c, 0.0, y],
+            [0.0, 0.0, 1.0, z]]
+
+
+def overlaps(matrices):
+    return sorted(find_overlaps(matrices, WIDTH, DEPTH, HEIGHT))
+
+
+def test_touching_windows_do_not_overlap():
+    assert overlaps([placement(0.0), placement(1.0)]) == []
+    assert overlaps([placement(0.0), placement(0.0, z=1.0)]) == []
+
+
+def test_overlapping_windows():
+    assert overlaps([placement(0.0), placement(1.0), placement(0.5)]) == [(0, 2), (1, 2)]
+    assert overlaps([placement(0.0), placement(0.0)]) == [(0, 1)]
+
+
+def test_separate_windows():
+    assert overlaps([placement(0.0), placement(1.5), placement(0.0, z=2.0)]) == []
+
+
+def test_quarter_turn():
+    # Rotated window spans x - 0.1 .. x, y 0 .. 1
+    assert overlaps([placement(0.0), placement(1.2, angle=math.pi / 2)]) == []
+    assert overlaps([placement(0.0), placement(1.0, angle=math.pi / 2)]) == [(0, 1)]
+    assert overlaps([placement(0.0), placement(0.5, -0.5, angle=math.pi / 2)]) == [(0, 1)]
+
+
+def test_arbitrary_rotation():
+    # Corner of the rotated window reaches back into the first one
+    assert overlaps([placement(0.0), placement(1.05, angle=math.pi / 4)]) == [(0, 1)]
+    # Rotated away from the first window
+    assert overlaps([placement(0.0), placement(1.05, angle=-math.pi / 4)]) == []
+    # Bounds overlap, boxes do not
+    assert overlaps([placement(0.0), placement(1.3, -0.4, angle=math.pi / 4)]) == []
+
+
+def test_boxes_overlap_is_symmetric():
+    a = placement_box(placement(0.0), WIDTH, DEPTH, HEIGHT)
+    b = placement_box(placement(1.05, angle=math.pi / 4), WIDTH, DEPTH, HEIGHT)
+    c = placement_box(placement(1.0), WIDTH, DEPTH, HEIGHT)
+    assert boxes_overlap(a, b) and boxes_overlap(b, a)
+    assert not boxes_overlap(a, c) and not boxes_overlap(c, a)
+
+
+def test_skip_keeps_first_window_of_each_pair():
+    assert non_overlapping(3, [(0, 2), (1, 2)]) == [0, 1]
+    # Window 1 is dropped for window 0, so it does not drop window 2
+    assert non_overlapping(3, [(0, 1), (1, 2)]) == [0, 2]
+    assert non_overlapping(4, []) == [0, 1, 2, 3]
+
+
+def test_skip_leaves_no_overlaps():
+    matrices = [placement(0.5 * i) for i in range(10)]
+    kept = non_overlapping(len(matrices), find_overlaps(matrices, WIDTH, DEPTH, HEIGHT))
+    assert kept == [0, 2, 4, 6, 8]
+    assert find_overlaps([matrices[i] for i in kept], WIDTH, DEPTH, HEIGHT) == []
+
+
+def test_grid_matches_brute_force():
+    rng = random.Random(4)
+    matrices = [placement(rng.uniform(0.0, 8.0), rng.uniform(0.0, 8.0), rng.uniform(0.0, 2.0),
+                          rng.choice((0.0, math.pi / 2, rng.uniform(0.0, 2 * math.pi))))
+                for _ in range(300)]
+
+    boxes = [placement_box(m, WIDTH, DEPTH, HEIGHT) for m in matrices]
+    expected = [(j, i) for i in range(len(boxes)) for j in range(i) if boxes_overlap(boxes[j], boxes[i])]
+
+    assert expected
+    assert overlaps(matrices) == sorted(expected)
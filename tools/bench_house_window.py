@@ -0,0 +1,207 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Benchmark of house window generation across scale tiers
+#
+# blender --background --factory-startup --python tools/bench_house_window.py -- \
+#     [--tiers 1 100 10000 100000] [--subdivisions 0 2] [--output bench.json]
+#
+# For every tier (number of windows) and subdivision level it times separately:
+#   generate    - window arrays for every window (template path, subdivided with MeshBuilder)
+#   tile        - merging all windows into one set of arrays
+#   dedup       - welding the merged arrays again with MeshBuilder
+#   overlaps    - checking all placements for overlapping windows
+#   cache_hit   - loading the merged arrays from the disk cache (placement digest included),
+#                 compare with tile
+#   wall        - wall with one opening per window
+#   wall_cache_hit - loading that wall from the disk cache, compare with wall
+#   upload      - writing the merged arrays into a new mesh datablock
+#   regenerate  - "Change Parameters" path, rewriting the same mesh with new sizes
+# upload and regenerate need Blender and are null when run in plain Python.
+# Results are written as JSON so runs of different plugin versions can be compared.
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import add_mesh_house_window  # noqa: E402
+from add_mesh_house_window import geometry  # noqa: E402
+from add_mesh_house_window.diskcache import GeometryCache, matrices_digest  # noqa: E402
+
+
+def script_arguments():
+    if bpy is None:
+        argv = sys.argv[1:]
+    else:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(prog="bench_house_window.py",
+                                     description="Benchmark house window generation")
+    parser.add_argument("--tiers", type=int, nargs="+", default=[1, 100, 10000, 100000],
+                        help="Numbers of windows")
+    parser.add_argument("--subdivisions", type=int, nargs="+", default=[0, 2],
+                        help="Subdivision levels of every window face")
+    parser.add_argument("--subdivided-max-tier", type=int, default=1000,
+                        help="Skip subdivided variants above this number of windows")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs per phase")
+    parser.add_argument("--output", default=None, help="JSON file (stdout if omitted)")
+    return parser.parse_args(argv)
+
+
+def timed(repeat, func, *args):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def lerp(a, b, t):
+    return [a[i] + (b[i] - a[i]) * t for i in range(3)]
+
+
+# Split every quad of the window into (level + 1)^2 quads
+def subdivided_window(arrays, level):
+    coords, vertex_indices, loop_starts, loop_totals = arrays
+    if level == 0:
+        return arrays
+
+    cuts = level + 1
+    builder = geometry.MeshBuilder()
+    for start, total in zip(loop_starts, loop_totals):
+        a, b, c, d = [coords[3 * i:3 * i + 3] for i in vertex_indices[start:start + total]]
+        grid = [[lerp(lerp(a, b, u / cuts), lerp(d, c, u / cuts), v / cuts) for u in range(cuts + 1)]
+                for v in range(cuts + 1)]
+        for v in range(cuts):
+            for u in range(cuts):
+                builder.add_face([grid[v][u], grid[v][u + 1], grid[v + 1][u + 1], grid[v + 1][u]])
+    return builder.to_arrays()
+
+
+def generate_windows(count, level, scale=1.0):
+    return [subdivided_window(geometry.window_arrays(scale * (1.0 + (i % 10) * 0.1), scale, 0.1, 0.1), level)
+            for i in range(count)]
+
+
+# Square-ish facade grid with 0.5 gap, rows of matrices as plain lists
+def facade_placements(count):
+    columns = max(1, int(count ** 0.5))
+    return [[[1, 0, 0, (i % columns) * 2.5], [0, 1, 0, 0], [0, 0, 1, (i // columns) * 2.5]]
+            for i in range(count)]
+
+
+def weld(arrays):
+    coords, vertex_indices, loop_starts, loop_totals = arrays
+    builder = geometry.MeshBuilder()
+    for start, total in zip(loop_starts, loop_totals):
+        builder.add_face([coords[3 * i:3 * i + 3] for i in vertex_indices[start:start + total]])
+    return builder
+
+
+def upload(arrays):
+    from add_mesh_house_window.operators import mesh_from_arrays
+
+    mesh = bpy.data.meshes.new(name='House Window Benchmark')
+    mesh_from_arrays(mesh, *arrays)
+    return mesh
+
+
+# Time of a cache hit for arrays, including the key computation as done by operators
+def cached_load(repeat, kind, values, arrays):
+    directory = tempfile.mkdtemp(prefix="bench_house_window_")
+    try:
+        cache = GeometryCache(directory, add_mesh_house_window.bl_info["version"], max_bytes=1 << 40)
+        cache.arrays(kind, values(), lambda: arrays)
+        best, _ = timed(repeat, lambda: cache.arrays(kind, values(), lambda: arrays))
+    finally:
+        shutil.rmtree(directory)
+    return best
+
+
+def facade_openings(count):
+    columns = max(1, int(count ** 0.5))
+    rows = (count + columns - 1) // columns
+    return columns * 2.5 + 0.5, rows * 2.5 + 0.5, geometry.grid_openings(columns * 2.5 + 0.5, rows, columns,
+                                                                          1.0, 1.0, 1.5, 1.5, 0.5)[:count]
+
+
+def run_tier(count, level, repeat):
+    generate_time, windows = timed(repeat, generate_windows, count, level)
+    placements = facade_placements(count)
+    tile_time, merged = timed(repeat, geometry.tile_mesh_arrays, *windows[0], placements)
+    dedup_time, _ = timed(repeat, weld, merged)
+    overlap_time, _ = timed(repeat, geometry.find_overlaps, placements, 1.9, 0.1, 1.0)
+    cache_hit_time = cached_load(repeat, "merged", lambda: (count, level, matrices_digest(placements)), merged)
+
+    width, height, openings = facade_openings(count)
+    wall_time, wall = timed(repeat, geometry.wall_arrays, width, height, 0.3, openings)
+    wall_cache_hit_time = cached_load(repeat, "wall", lambda: (width, height, 0.3, tuple(openings)), wall)
+
+    result = {
+        "windows": count,
+        "subdivisions": level,
+        "vertices": len(merged[0]) // 3,
+        "faces": len(merged[3]),
+        "generate": generate_time,
+        "tile": tile_time,
+        "dedup": dedup_time,
+        "overlaps": overlap_time,
+        "cache_hit": cache_hit_time,
+        "wall": wall_time,
+        "wall_cache_hit": wall_cache_hit_time,
+        "upload": None,
+        "regenerate": None,
+    }
+
+    if bpy is not None:
+        from add_mesh_house_window.operators import update_mesh_arrays
+
+        result["upload"], mesh = timed(1, upload, merged)
+
+        resized = geometry.tile_mesh_arrays(*generate_windows(1, level, scale=1.5)[0], placements)
+        result["regenerate"], _ = timed(repeat, update_mesh_arrays, mesh, *resized)
+        bpy.data.meshes.remove(mesh)
+
+    return result
+
+
+def main():
+    args = script_arguments()
+
+    results = []
+    for level in args.subdivisions:
+        for count in args.tiers:
+            if level and count > args.subdivided_max_tier:
+                continue
+            results.append(run_tier(count, level, args.repeat))
+            print("bench_house_window: %d windows, subdivisions %d done" % (count, level), file=sys.stderr)
+
+    report = {
+        "plugin_version": list(add_mesh_house_window.bl_info["version"]),
+        "blender": bpy.app.version_string if bpy is not None else None,
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
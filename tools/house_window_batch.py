@@ -0,0 +1,138 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Headless batch generation of house windows
+#
+# blender --background --factory-startup --python tools/house_window_batch.py -- \
+#     SPEC --output DIR [--format blend|obj] [--jobs N]
+#
+# SPEC is a JSON list of records or a CSV file with a header line. Every record
+# may contain "name", "pp_Width", "pp_Height", "pp_Depth", "pp_FrameWidth" and
+# "lod", missing values use the operator defaults. Every record is written to its
+# own DIR/<name>.blend or DIR/<name>.obj file (see house_window_export.py for a
+# single deduplicated OBJ or glTF file).
+#
+# With --jobs N > 1 the records are split into N shards and every shard is
+# generated by a separate Blender process started with --shard INDEX/COUNT.
+#
+# OBJ output does not need Blender at all, the script also runs in plain Python
+# (python tools/house_window_batch.py SPEC --output DIR --format obj) and then
+# shards the work over a multiprocessing pool.
+
+import argparse
+import os
+import subprocess
+import sys
+from multiprocessing import Pool
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from add_mesh_house_window import geometry  # noqa: E402
+from add_mesh_house_window.export import load_records, write_obj  # noqa: E402
+
+
+def script_arguments():
+    if bpy is None:
+        argv = sys.argv[1:]
+    else:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(prog="house_window_batch.py",
+                                     description="Generate house window meshes in background Blender")
+    parser.add_argument("spec", help="JSON or CSV file with window parameters")
+    parser.add_argument("--output", required=True, help="Output directory")
+    parser.add_argument("--format", choices=("blend", "obj"), default="blend")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of Blender worker processes")
+    parser.add_argument("--shard", default=None, help="INDEX/COUNT, used by worker processes")
+    return parser.parse_args(argv)
+
+
+def write_blend(filepath, name, arrays, params, lod):
+    from add_mesh_house_window.operators import hw_store_parameters, mesh_from_arrays
+
+    mesh = bpy.data.meshes.new(name=name)
+    mesh_from_arrays(mesh, *arrays)
+    hw_store_parameters(mesh, params, lod)
+
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.data.libraries.write(filepath, {obj}, fake_user=True)
+
+    # Keep memory flat over long shards
+    bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(mesh)
+
+
+def generate(windows, output, file_format):
+    for name, params, lod in windows:
+        filepath = os.path.join(output, "%s.%s" % (name, file_format))
+        params[3] = geometry.clamp_frame_width(params[0], params[1], params[3])
+        arrays = geometry.window_arrays(*params, variant=lod)
+
+        if file_format == "obj":
+            write_obj(filepath, name, *arrays)
+        else:
+            write_blend(filepath, name, arrays, params, lod)
+
+
+def generate_shard(windows, output, file_format, index, count):
+    generate(windows[index::count], output, file_format)
+
+
+# Start one background Blender per shard (or one pool process without Blender)
+# and wait for all of them
+def run_workers(args, windows, jobs):
+    if bpy is None:
+        with Pool(jobs) as pool:
+            pool.starmap(generate_shard, [(windows, args.output, args.format, index, jobs)
+                                          for index in range(jobs)])
+        return 0
+
+    script = os.path.abspath(__file__)
+    workers = []
+    for index in range(jobs):
+        command = [bpy.app.binary_path, "--background", "--factory-startup", "--python", script, "--",
+                   args.spec, "--output", args.output, "--format", args.format,
+                   "--shard", "%d/%d" % (index, jobs)]
+        workers.append(subprocess.Popen(command))
+
+    failed = [index for index, worker in enumerate(workers) if worker.wait() != 0]
+    if failed:
+        print("house_window_batch: shards %s failed" % ", ".join(str(i) for i in failed))
+        return 1
+    return 0
+
+
+def main():
+    args = script_arguments()
+    if bpy is None and args.format != "obj":
+        print("house_window_batch: %s output needs Blender" % args.format)
+        return 1
+
+    windows = load_records(args.spec)
+    os.makedirs(args.output, exist_ok=True)
+
+    if args.shard is None and args.jobs > 1 and len(windows) > 1:
+        return run_workers(args, windows, min(args.jobs, len(windows)))
+
+    if args.shard is not None:
+        index, count = (int(v) for v in args.shard.split("/"))
+        windows = windows[index::count]
+
+    generate(windows, args.output, args.format)
+    print("house_window_batch: %d windows written to %s" % (len(windows), args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        code = main()
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        code = 1
+    sys.exit(code)
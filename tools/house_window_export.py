@@ -0,0 +1,45 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Export of a window catalogue to one OBJ or binary glTF file
+#
+# python tools/house_window_export.py SPEC OUTPUT.obj|OUTPUT.glb
+#
+# SPEC is the same JSON or CSV record file as for house_window_batch.py. Windows
+# with identical parameters are written once and referenced by every record
+# using them. No Blender is needed and no datablocks are created, geometry is
+# streamed to the file as it is generated (see add_mesh_house_window.export).
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from add_mesh_house_window import export  # noqa: E402
+
+
+def script_arguments():
+    parser = argparse.ArgumentParser(prog="house_window_export.py",
+                                     description="Export house windows to one OBJ or glTF file")
+    parser.add_argument("spec", help="JSON or CSV file with window parameters")
+    parser.add_argument("output", help="Output .obj or .glb file")
+    return parser.parse_args()
+
+
+def main():
+    args = script_arguments()
+
+    records = export.load_records(args.spec)
+    export.export_file(records, args.output)
+    print("house_window_export: %d windows written to %s" % (len(records), args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        code = main()
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        code = 1
+    sys.exit(code)